@@ -5,6 +5,13 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from components import (
+    category_pie, paginated_results, score_histogram, show_streaming_analysis, streaming_mode_toggle,
+    data_quality_notes, feature_analysis, summary_metrics, upload_columns
+)
+from scoring import FEATURE_COLUMNS, FEATURE_DESCRIPTIONS, ScoredDataset, content_key, get_model, scored_datasets
+from scoring.io import UPLOAD_TYPES, read_table
+
 # Page configuration
 st.set_page_config(
     page_title="Entab's Lead Scoring System",
@@ -17,49 +24,8 @@ st.title("🎓 Entab's Lead Scoring System")
 st.markdown("---")
 
 
-def calculate_lead_score(location_score, how_you_know_us_score, sibling_in_school_score,
-                         previous_school_name_score, class_applied_for_score,
-                         last_class_percentage_score, communication_email_different_score,
-                         whatsapp_number_different_score):
-    """Calculate lead score using the corrected formula"""
-
-    # Weights for each factor
-    weights = [0.85, 0.70, 0.95, 0.55, 0.50, 0.25, 0.25, 0.20]
-    scores = [location_score, how_you_know_us_score, sibling_in_school_score,
-              previous_school_name_score, class_applied_for_score,
-              last_class_percentage_score, communication_email_different_score,
-              whatsapp_number_different_score]
-
-    # Calculate weighted sum
-    weighted_sum = sum(score * weight for score, weight in zip(scores, weights))
-
-    # Calculate total weights
-    total_weights = sum(weights)
-
-    # Calculate final score (this will be between 0-100)
-    lead_score = (weighted_sum / total_weights)
-
-    return lead_score
-
-
-def categorize_lead(score):
-    """Categorize leads based on score"""
-    if score >= 80:
-        return "Hot Lead"
-    elif score >= 60:
-        return "Warm Lead"
-    else:
-        return "Cold Lead"
-
-
-def get_lead_color(category):
-    """Get color for lead category"""
-    colors = {
-        "Hot Lead": "#FF4B4B",
-        "Warm Lead": "#FFA500",
-        "Cold Lead": "#4B8BFF"
-    }
-    return colors.get(category, "#808080")
+# Scoring model shared with the API; built once per process, not per rerun
+model = get_model("standard")
 
 
 # Main tabs for navigation
@@ -93,15 +59,15 @@ with tab1:
                                                     help="Whether WhatsApp number differs from registration number")
 
     # Calculate score automatically
-    score = calculate_lead_score(
+    score = model.score_one(
         location_score, how_you_know_us_score, sibling_in_school_score,
         previous_school_name_score, class_applied_for_score,
         last_class_percentage_score, communication_email_different_score,
         whatsapp_number_different_score
     )
 
-    category = categorize_lead(score)
-    color = get_lead_color(category)
+    category = model.categorize_one(score)
+    color = model.color(category)
 
     # Display results
     st.markdown("---")
@@ -145,22 +111,24 @@ with tab2:
     st.header("Bulk CSV Analysis")
 
     # File upload
-    uploaded_file = st.file_uploader("Choose a CSV file", type="csv")
+    uploaded_file = st.file_uploader("Choose a CSV, Parquet or Arrow file", type=UPLOAD_TYPES)
 
-    if uploaded_file is not None:
+    if uploaded_file is not None and streaming_mode_toggle(uploaded_file, key="bulk_streaming"):
+        show_streaming_analysis(uploaded_file, model, key="bulk")
+
+    elif uploaded_file is not None:
         try:
-            df = pd.read_csv(uploaded_file)
+            # Parsed and scored uploads are cached by content, so widget reruns skip both
+            fmt, read_columns = upload_columns(uploaded_file, key="bulk")
+            upload_key = content_key(uploaded_file, model, *read_columns)
+            scored = scored_datasets.get(upload_key)
+            df = scored.frame if scored is not None else read_table(uploaded_file, fmt, columns=read_columns)
 
             st.subheader("📋 Data Preview")
-            st.dataframe(df.head())
+            st.dataframe(df.head().drop(columns=['lead_score', 'lead_category'], errors='ignore'))
 
             # Check if required columns exist
-            required_columns = [
-                'location_score', 'how_you_know_us_score', 'sibling_in_school_score',
-                'previous_school_name_score', 'class_applied_for_score',
-                'last_class_percentage_score', 'communication_email_different_score',
-                'whatsapp_number_different_score'
-            ]
+            required_columns = FEATURE_COLUMNS
 
             missing_columns = [col for col in required_columns if col not in df.columns]
 
@@ -168,31 +136,16 @@ with tab2:
                 st.error(f"Missing required columns: {', '.join(missing_columns)}")
                 st.info("Please ensure your CSV has all required columns with the exact names shown above.")
             else:
-                # Calculate lead scores for all rows
-                df['lead_score'] = df.apply(lambda row: calculate_lead_score(
-                    row['location_score'], row['how_you_know_us_score'],
-                    row['sibling_in_school_score'], row['previous_school_name_score'],
-                    row['class_applied_for_score'], row['last_class_percentage_score'],
-                    row['communication_email_different_score'], row['whatsapp_number_different_score']
-                ), axis=1)
+                if scored is None:
+                    # Calculate lead scores for all rows along with their summary statistics
+                    scored = scored_datasets.put(upload_key, ScoredDataset.from_frame(df, model))
 
-                df['lead_category'] = df['lead_score'].apply(categorize_lead)
+                stats = scored.stats
+                data_quality_notes(scored)
 
                 # Display summary statistics
                 st.subheader("📊 Summary Statistics")
-                col1, col2, col3, col4 = st.columns(4)
-
-                with col1:
-                    st.metric("Total Students", len(df))
-
-                with col2:
-                    st.metric("Average Score", f"{df['lead_score'].mean():.1f}")
-
-                with col3:
-                    st.metric("Hot Leads", len(df[df['lead_category'] == 'Hot Lead']))
-
-                with col4:
-                    st.metric("Warm Leads", len(df[df['lead_category'] == 'Warm Lead']))
+                summary_metrics(stats)
 
                 # Create visualizations
                 st.subheader("📈 Lead Distribution")
@@ -201,62 +154,14 @@ with tab2:
 
                 with col1:
                     # Pie chart for lead categories
-                    category_counts = df['lead_category'].value_counts()
-
-                    fig_pie = px.pie(
-                        values=category_counts.values,
-                        names=category_counts.index,
-                        title="Lead Categories Distribution",
-                        color=category_counts.index,
-                        color_discrete_map={
-                            "Hot Lead": "#FF4B4B",
-                            "Warm Lead": "#FFA500",
-                            "Cold Lead": "#4B8BFF"
-                        }
-                    )
-                    fig_pie.update_traces(textposition='inside', textinfo='percent+label')
-                    st.plotly_chart(fig_pie, use_container_width=True)
+                    st.plotly_chart(category_pie(stats), use_container_width=True)
 
                 with col2:
                     # Histogram of lead scores
-                    fig_hist = px.histogram(
-                        df,
-                        x='lead_score',
-                        nbins=20,
-                        title="Lead Score Distribution",
-                        color='lead_category',
-                        color_discrete_map={
-                            "Hot Lead": "#FF4B4B",
-                            "Warm Lead": "#FFA500",
-                            "Cold Lead": "#4B8BFF"
-                        }
-                    )
-                    fig_hist.update_layout(xaxis_title="Lead Score", yaxis_title="Count")
-                    st.plotly_chart(fig_hist, use_container_width=True)
-
-                # Feature importance analysis
-                st.subheader("🔍 Feature Analysis")
-
-                # Calculate correlation with lead score
-                feature_columns = required_columns
-                correlations = []
-
-                for col in feature_columns:
-                    corr = df[col].corr(df['lead_score'])
-                    correlations.append({'Feature': col.replace('_', ' ').title(), 'Correlation': corr})
+                    st.plotly_chart(score_histogram(stats), use_container_width=True)
 
-                corr_df = pd.DataFrame(correlations).sort_values('Correlation', ascending=True)
-
-                fig_bar = px.bar(
-                    corr_df,
-                    x='Correlation',
-                    y='Feature',
-                    orientation='h',
-                    title="Feature Correlation with Lead Score",
-                    color='Correlation',
-                    color_continuous_scale='RdYlBu_r'
-                )
-                st.plotly_chart(fig_bar, use_container_width=True)
+                # Feature correlations and contributions, from the moments cached with the dataset
+                feature_analysis(stats, key="bulk_features")
 
                 # Display detailed results
                 st.subheader("📋 Detailed Results")
@@ -264,37 +169,31 @@ with tab2:
                 # Add filters
                 col1, col2 = st.columns(2)
                 with col1:
+                    present_categories = [label for label, count in zip(model.labels, stats.category_counts)
+                                          if count]
                     category_filter = st.multiselect(
                         "Filter by Lead Category",
-                        options=df['lead_category'].unique(),
-                        default=df['lead_category'].unique()
+                        options=present_categories,
+                        default=present_categories
                     )
 
                 with col2:
-                    score_range = st.slider(
-                        "Filter by Score Range",
-                        min_value=float(df['lead_score'].min()),
-                        max_value=float(df['lead_score'].max()),
-                        value=(float(df['lead_score'].min()), float(df['lead_score'].max()))
-                    )
-
-                # Apply filters
-                filtered_df = df[
-                    (df['lead_category'].isin(category_filter)) &
-                    (df['lead_score'] >= score_range[0]) &
-                    (df['lead_score'] <= score_range[1])
-                    ]
-
-                st.dataframe(filtered_df[['lead_score', 'lead_category'] + required_columns])
-
-                # Download button for results
-                csv = filtered_df.to_csv(index=False)
-                st.download_button(
-                    label="Download Results as CSV",
-                    data=csv,
-                    file_name="lead_scoring_results.csv",
-                    mime="text/csv"
-                )
+                    # No range to pick from when missing features left every lead unscored
+                    if stats.scored:
+                        score_range = st.slider(
+                            "Filter by Score Range",
+                            min_value=stats.score_min,
+                            max_value=stats.score_max,
+                            value=(stats.score_min, stats.score_max)
+                        )
+                    else:
+                        st.info("No lead has a complete set of feature scores, so none could be scored.")
+                        score_range = (stats.bin_edges[0], stats.bin_edges[-1])
+
+                # Apply filters through the prebuilt score index and show one page at a time
+                paginated_results(df, scored.index, score_range[0], score_range[1], key="bulk_results",
+                                  columns=['lead_score', 'lead_category'] + required_columns,
+                                  lead_category=category_filter)
 
         except Exception as e:
             st.error(f"Error processing file: {str(e)}")
@@ -330,21 +229,20 @@ with tab2:
 with tab3:
     st.header("About the Lead Scoring Formula")
 
-    st.markdown("""
+    # Render the formula from the model so the documentation cannot drift from the code
+    weighted_terms = " + \n                  ".join(
+        f"({col} × {weight:.2f})" for col, weight in zip(FEATURE_COLUMNS, model.weights)
+    )
+    weight_total = " + ".join(f"{weight:.2f}" for weight in model.weights)
+
+    st.markdown(f"""
     ### Formula Breakdown
 
     The lead scoring system uses a weighted average of 8 different factors:
 
     ```
-    lead_score = [(location_score × 0.85) + 
-                  (how_you_know_us_score × 0.70) + 
-                  (sibling_in_school_score × 0.95) + 
-                  (previous_school_name_score × 0.65) + 
-                  (class_applied_for_score × 0.60) + 
-                  (last_class_percentage_score × 0.55) + 
-                  (communication_email_different_score × 0.45) + 
-                  (whatsapp_number_different_score × 0.40)] 
-                  ÷ (0.85 + 0.70 + 0.85 + 0.65 + 0.60 + 0.55 + 0.45 + 0.40)
+    lead_score = [{weighted_terms}] 
+                  ÷ ({weight_total})
     ```
 
     ### Factor Weights & Importance
@@ -352,25 +250,12 @@ with tab3:
 
     # Create weights visualization
     weights_data = {
-        'Factor': [
-            'Location Score', 'Sibling in School', 'How You Know Us',
-            'Previous School Name', 'Class Applied For', 'Last Class Percentage',
-            'Communication Email Different', 'WhatsApp Number Different'
-        ],
-        'Weight': [0.85, 0.85, 0.70, 0.65, 0.60, 0.55, 0.45, 0.40],
-        'Description': [
-            'Proximity to school location',
-            'Whether student has siblings in school',
-            'Source of school awareness',
-            'Quality of previous school',
-            'Grade level applying for',
-            'Academic performance',
-            'Email consistency check',
-            'Phone number consistency check'
-        ]
+        'Factor': [col.replace('_score', '').replace('_', ' ').title() for col in FEATURE_COLUMNS],
+        'Weight': list(model.weights),
+        'Description': [FEATURE_DESCRIPTIONS[col] for col in FEATURE_COLUMNS]
     }
 
-    weights_df = pd.DataFrame(weights_data)
+    weights_df = pd.DataFrame(weights_data).sort_values('Weight', ascending=False)
 
     fig_weights = px.bar(
         weights_df,
@@ -1,10 +1,16 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
 import plotly.graph_objects as go
-import random
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from components import (
+    category_pie, paginated_results, score_histogram, show_streaming_analysis, streaming_mode_toggle,
+    data_quality_notes, summary_metrics, upload_columns
+)
+from scoring import FEATURE_COLUMNS, ScoredDataset, content_key, get_model, scored_datasets
+from scoring.synthetic import generate_leads
+from scoring.io import UPLOAD_TYPES, read_table
 
 # Page configuration
 st.set_page_config(
@@ -19,191 +25,13 @@ st.markdown("### Intelligent Student Enrollment Prediction & Analysis")
 st.markdown("---")
 
 
-def generate_sample_data(num_students=100):
-    """Generate realistic sample data for demonstration"""
-
-    # Sample student names
-    first_names = [
-        "Aarav", "Aditi", "Arjun", "Ananya", "Ishaan", "Kavya", "Rohan", "Priya",
-        "Vivaan", "Diya", "Aditya", "Siya", "Karan", "Riya", "Vihaan", "Asha",
-        "Aryan", "Meera", "Reyansh", "Tara", "Ayaan", "Neha", "Rudra", "Pooja",
-        "Shivansh", "Shreya", "Arnav", "Khushi", "Kabir", "Nisha", "Devansh", "Ritika",
-        "Atharv", "Sakshi", "Hriday", "Bhavya", "Advait", "Tanvi", "Pranav", "Simran",
-        "Samarth", "Avni", "Parth", "Janvi", "Dhruv", "Kiara", "Vedant", "Myra",
-        "Anirudh", "Anika", "Shaurya", "Palak", "Krish", "Dia", "Yash", "Ira",
-        "Harsh", "Zara", "Nikhil", "Manya", "Raghav", "Mahika", "Siddharth", "Sejal"
-    ]
-
-    last_names = [
-        "Sharma", "Gupta", "Singh", "Kumar", "Patel", "Shah", "Agarwal", "Bansal",
-        "Jain", "Mittal", "Agrawal", "Chopra", "Malhotra", "Arora", "Kapoor", "Mehta",
-        "Verma", "Pandey", "Saxena", "Goyal", "Sinha", "Yadav", "Mishra", "Tiwari",
-        "Bhardwaj", "Kashyap", "Srivastava", "Chandra", "Bhatia", "Khanna", "Tandon", "Sethi"
-    ]
-
-    # Sample previous schools
-    previous_schools = [
-        "Delhi Public School", "Kendriya Vidyalaya", "Ryan International", "DAV Public School",
-        "St. Mary's Convent", "Holy Child School", "Modern School", "Bal Bharati Public School",
-        "Cambridge School", "Springdales School", "Amity International", "Gyan Bharati School",
-        "Little Angels School", "St. Xavier's School", "Mount Carmel School", "Sacred Heart School",
-        "Bharatiya Vidya Bhavan", "Lotus Valley School", "Heritage School", "Birla Public School"
-    ]
-
-    # Sample locations (with varying distances from school)
-    locations = [
-        ("Connaught Place", 95), ("Karol Bagh", 85), ("Lajpat Nagar", 80), ("Rajouri Garden", 75),
-        ("Dwarka", 70), ("Rohini", 65), ("Janakpuri", 80), ("Vasant Kunj", 85), ("Saket", 90),
-        ("Greater Kailash", 95), ("Nehru Place", 85), ("Tilak Nagar", 70), ("Pitampura", 60),
-        ("Preet Vihar", 75), ("Mayur Vihar", 70), ("Ashok Vihar", 65), ("Model Town", 80),
-        ("Civil Lines", 85), ("Khan Market", 95), ("Defence Colony", 90), ("Laxmi Nagar", 60),
-        ("Shahdara", 50), ("Uttam Nagar", 55), ("Najafgarh", 45), ("Narela", 40)
-    ]
-
-    # How they know us options
-    know_us_sources = [
-        ("School Website", 60), ("Google Search", 65), ("Social Media", 70), ("Friend Referral", 85),
-        ("Newspaper Ad", 50), ("Hoarding/Banner", 45), ("Educational Fair", 75), ("Alumni Referral", 90),
-        ("Current Parent Referral", 95), ("Teacher Referral", 88), ("Brochure", 55), ("Walk-in", 40)
-    ]
-
-    # Classes available
-    classes = [
-        ("Nursery", 70), ("LKG", 75), ("UKG", 80), ("Class 1", 85), ("Class 2", 80),
-        ("Class 3", 75), ("Class 4", 70), ("Class 5", 65), ("Class 6", 85), ("Class 7", 80),
-        ("Class 8", 75), ("Class 9", 90), ("Class 10", 85), ("Class 11", 95), ("Class 12", 90)
-    ]
-
-    data = []
-
-    for i in range(num_students):
-        # Generate student name
-        first_name = random.choice(first_names)
-        last_name = random.choice(last_names)
-        student_name = f"{first_name} {last_name}"
-
-        # Location
-        location, location_score = random.choice(locations)
-        location_score += random.randint(-10, 10)
-        location_score = max(0, min(100, location_score))
-
-        # How they know us
-        source, know_score = random.choice(know_us_sources)
-        know_score += random.randint(-5, 15)
-        know_score = max(0, min(100, know_score))
-
-        # Sibling in school (30% chance)
-        has_sibling = random.random() < 0.3
-        sibling_score = 100 if has_sibling else random.randint(0, 20)
-
-        # Previous school
-        prev_school = random.choice(previous_schools)
-        if "DPS" in prev_school or "St." in prev_school or "Modern" in prev_school:
-            prev_school_score = random.randint(80, 95)
-        elif "Ryan" in prev_school or "DAV" in prev_school or "Amity" in prev_school:
-            prev_school_score = random.randint(70, 85)
-        else:
-            prev_school_score = random.randint(50, 75)
-
-        # Class applied for
-        class_name, class_score = random.choice(classes)
-        class_score += random.randint(-5, 10)
-        class_score = max(0, min(100, class_score))
-
-        # Last class percentage
-        if class_name in ["Nursery", "LKG", "UKG"]:
-            percentage_score = random.randint(70, 100)
-        else:
-            percentage = random.randint(65, 98)
-            if percentage >= 90:
-                percentage_score = 95
-            elif percentage >= 80:
-                percentage_score = 80
-            elif percentage >= 70:
-                percentage_score = 65
-            else:
-                percentage_score = 40
-
-        # Contact variations
-        email_different = random.random() < 0.2
-        email_score = 0 if not email_different else random.randint(60, 100)
-
-        whatsapp_different = random.random() < 0.25
-        whatsapp_score = 0 if not whatsapp_different else random.randint(50, 100)
-
-        # Generate contact info
-        email = f"{first_name.lower()}.{last_name.lower()}@{'gmail.com' if random.random() < 0.7 else random.choice(['yahoo.com', 'hotmail.com', 'outlook.com'])}"
-        phone = f"+91-{random.randint(7000000000, 9999999999)}"
-
-        data.append({
-            'student_name': student_name,
-            'email': email,
-            'phone': phone,
-            'location': location,
-            'location_score': location_score,
-            'how_you_know_us': source,
-            'how_you_know_us_score': know_score,
-            'has_sibling_in_school': "Yes" if has_sibling else "No",
-            'sibling_in_school_score': sibling_score,
-            'previous_school_name': prev_school,
-            'previous_school_name_score': prev_school_score,
-            'class_applied_for': class_name,
-            'class_applied_for_score': class_score,
-            'last_class_percentage': f"{random.randint(65, 98)}%" if class_name not in ["Nursery", "LKG",
-                                                                                        "UKG"] else "N/A",
-            'last_class_percentage_score': percentage_score,
-            'communication_email_different': "Yes" if email_different else "No",
-            'communication_email_different_score': email_score,
-            'whatsapp_number_different': "Yes" if whatsapp_different else "No",
-            'whatsapp_number_different_score': whatsapp_score,
-            'application_date': (datetime.now() - timedelta(days=random.randint(1, 60))).strftime("%Y-%m-%d")
-        })
-
-    return pd.DataFrame(data)
-
-
-def calculate_lead_score(location_score, how_you_know_us_score, sibling_in_school_score,
-                         previous_school_name_score, class_applied_for_score,
-                         last_class_percentage_score, communication_email_different_score,
-                         whatsapp_number_different_score):
-    """Calculate lead score using weighted formula"""
-
-    weights = [0.85, 0.70, 0.95, 0.55, 0.50, 0.25, 0.25, 0.20]
-    scores = [location_score, how_you_know_us_score, sibling_in_school_score,
-              previous_school_name_score, class_applied_for_score,
-              last_class_percentage_score, communication_email_different_score,
-              whatsapp_number_different_score]
-
-    weighted_sum = sum(score * weight for score, weight in zip(scores, weights))
-    total_weights = sum(weights)
-
-    lead_score = (weighted_sum / total_weights)
-    return round(lead_score, 2) + 5
-
-
-def categorize_lead(score):
-    """Categorize leads based on score"""
-    if score >= 80:
-        return "🔥 Hot Lead"
-    elif score >= 60:
-        return "🟡 Warm Lead"
-    else:
-        return "❄️ Cold Lead"
-
-
-def get_lead_color(category):
-    """Get color for lead category"""
-    colors = {
-        "🔥 Hot Lead": "#FF4B4B",
-        "🟡 Warm Lead": "#FFA500",
-        "❄️ Cold Lead": "#4B8BFF"
-    }
-    return colors.get(category, "#808080")
+# Scoring model for this dashboard (+5 offset, rounded); built once per process, not per rerun
+model = get_model("entab")
 
 
 # Generate sample data
 if 'sample_data' not in st.session_state:
-    st.session_state.sample_data = generate_sample_data(150)
+    st.session_state.sample_data = generate_leads(150)
 
 # Main tabs
 tab1, tab2, tab3 = st.tabs(["🎯 Individual Scoring", "📊 Sample Data Analysis", "📁 Upload CSV"])
@@ -314,15 +142,15 @@ with tab1:
         whatsapp_number_different_score = 0 if whatsapp_different == "No" else 60
 
     # Calculate score
-    score = calculate_lead_score(
+    score = model.score_one(
         location_score, how_you_know_us_score, sibling_in_school_score,
         previous_school_name_score, class_applied_for_score,
         last_class_percentage_score, communication_email_different_score,
         whatsapp_number_different_score
     )
 
-    category = categorize_lead(score)
-    color = get_lead_color(category)
+    category = model.categorize_one(score)
+    color = model.color(category)
 
     # Display results
     st.markdown("---")
@@ -365,9 +193,9 @@ with tab1:
 
     # Recommendations
     st.subheader("💡 Recommendations")
-    if score >= 80:
+    if score >= model.hot_threshold:
         st.success("🎉 **High Priority Lead!** Contact immediately and schedule a school visit.")
-    elif score >= 60:
+    elif score >= model.warm_threshold:
         st.warning("📞 **Good Prospect!** Follow up within 2-3 days with personalized communication.")
     else:
         st.info("📧 **Nurture Lead!** Add to newsletter and follow up periodically.")
@@ -376,66 +204,30 @@ with tab2:
     st.header("📊 Sample Data Analysis")
     st.markdown("*Analyze our generated sample dataset of 150 prospective students*")
 
-    # Calculate scores for sample data
-    df = st.session_state.sample_data.copy()
-
-    df['lead_score'] = df.apply(lambda row: calculate_lead_score(
-        row['location_score'], row['how_you_know_us_score'],
-        row['sibling_in_school_score'], row['previous_school_name_score'],
-        row['class_applied_for_score'], row['last_class_percentage_score'],
-        row['communication_email_different_score'], row['whatsapp_number_different_score']
-    ), axis=1)
+    # Score the sample data and build its summary and filter index once per session;
+    # the generated frame is scored and compacted in place rather than copied
+    if 'sample_scored' not in st.session_state:
+        st.session_state.sample_scored = ScoredDataset.from_frame(
+            st.session_state.sample_data, model, index_columns=('lead_category', 'class_applied_for')
+        )
 
-    df['lead_category'] = df['lead_score'].apply(categorize_lead)
+    sample_scored = st.session_state.sample_scored
+    df = sample_scored.frame
+    stats = sample_scored.stats
 
     # Summary metrics
-    col1, col2, col3, col4 = st.columns(4)
-
-    with col1:
-        st.metric("Total Students", len(df))
-    with col2:
-        st.metric("Average Score", f"{df['lead_score'].mean():.1f}")
-    with col3:
-        hot_leads = len(df[df['lead_category'] == '🔥 Hot Lead'])
-        st.metric("🔥 Hot Leads", hot_leads)
-    with col4:
-        warm_leads = len(df[df['lead_category'] == '🟡 Warm Lead'])
-        st.metric("🟡 Warm Leads", warm_leads)
+    summary_metrics(stats, hot_label="🔥 Hot Leads", warm_label="🟡 Warm Leads")
 
     # Visualizations
     col1, col2 = st.columns(2)
 
     with col1:
         # Category distribution
-        category_counts = df['lead_category'].value_counts()
-        fig_pie = px.pie(
-            values=category_counts.values,
-            names=category_counts.index,
-            title="Lead Category Distribution",
-            color=category_counts.index,
-            color_discrete_map={
-                "🔥 Hot Lead": "#FF4B4B",
-                "🟡 Warm Lead": "#FFA500",
-                "❄️ Cold Lead": "#4B8BFF"
-            }
-        )
-        fig_pie.update_traces(textposition='inside', textinfo='percent+label')
-        st.plotly_chart(fig_pie, use_container_width=True)
+        st.plotly_chart(category_pie(stats, title="Lead Category Distribution"), use_container_width=True)
 
     with col2:
         # Score distribution
-        fig_hist = px.histogram(
-            df, x='lead_score', nbins=20,
-            title="Lead Score Distribution",
-            color='lead_category',
-            color_discrete_map={
-                "🔥 Hot Lead": "#FF4B4B",
-                "🟡 Warm Lead": "#FFA500",
-                "❄️ Cold Lead": "#4B8BFF"
-            }
-        )
-        fig_hist.update_layout(xaxis_title="Lead Score", yaxis_title="Count")
-        st.plotly_chart(fig_hist, use_container_width=True)
+        st.plotly_chart(score_histogram(stats), use_container_width=True)
 
     # Top prospects
     st.subheader("🏆 Top 10 Prospects")
@@ -448,63 +240,54 @@ with tab2:
 
     col1, col2, col3 = st.columns(3)
     with col1:
+        present_categories = [label for label, count in zip(model.labels, stats.category_counts) if count]
         category_filter = st.multiselect(
             "Filter by Category",
-            options=df['lead_category'].unique(),
-            default=df['lead_category'].unique()
+            options=present_categories,
+            default=present_categories
         )
     with col2:
         class_filter = st.multiselect(
             "Filter by Class",
-            options=sorted(df['class_applied_for'].unique()),
-            default=sorted(df['class_applied_for'].unique())
+            options=sorted(sample_scored.index.values('class_applied_for')),
+            default=sorted(sample_scored.index.values('class_applied_for'))
         )
     with col3:
         score_range = st.slider("Score Range", 0, 100, (0, 100))
 
-    # Apply filters
-    filtered_df = df[
-        (df['lead_category'].isin(category_filter)) &
-        (df['class_applied_for'].isin(class_filter)) &
-        (df['lead_score'] >= score_range[0]) &
-        (df['lead_score'] <= score_range[1])
-        ]
+    # Apply filters through the prebuilt score index and show one page at a time
+    paginated_results(df, sample_scored.index, score_range[0], score_range[1], key="sample_results",
+                      file_name="filtered_leads", download_label="📥 Download Filtered Data",
+                      lead_category=category_filter, class_applied_for=class_filter)
 
-    st.dataframe(filtered_df, use_container_width=True)
-
-    # Download buttons
-    col1, col2 = st.columns(2)
-    with col1:
-        csv_data = filtered_df.to_csv(index=False)
-        st.download_button("📥 Download Filtered Data", csv_data, "filtered_leads.csv", "text/csv")
-    with col2:
-        scoring_template = df[['location_score', 'how_you_know_us_score', 'sibling_in_school_score',
-                               'previous_school_name_score', 'class_applied_for_score',
-                               'last_class_percentage_score', 'communication_email_different_score',
-                               'whatsapp_number_different_score']].head(10)
-        template_csv = scoring_template.to_csv(index=False)
-        st.download_button("📋 Download Scoring Template", template_csv, "scoring_template.csv", "text/csv")
+    # Download scoring template
+    scoring_template = df[FEATURE_COLUMNS].head(10)
+    template_csv = scoring_template.to_csv(index=False)
+    st.download_button("📋 Download Scoring Template", template_csv, "scoring_template.csv", "text/csv")
 
 with tab3:
     st.header("📁 Upload Your CSV File")
     st.markdown("*Upload your own student data for bulk lead scoring*")
 
-    uploaded_file = st.file_uploader("Choose a CSV file", type="csv", help="Upload a CSV file with student data")
+    uploaded_file = st.file_uploader("Choose a CSV, Parquet or Arrow file", type=UPLOAD_TYPES,
+                                     help="Upload a CSV, Parquet or Arrow IPC file with student data")
+
+    if uploaded_file is not None and streaming_mode_toggle(uploaded_file, key="upload_streaming"):
+        show_streaming_analysis(uploaded_file, model, key="upload")
 
-    if uploaded_file is not None:
+    elif uploaded_file is not None:
         try:
-            df_upload = pd.read_csv(uploaded_file)
+            # Parsed and scored uploads are cached by content, so widget reruns skip both
+            fmt, read_columns = upload_columns(uploaded_file, key="upload")
+            upload_key = content_key(uploaded_file, model, *read_columns)
+            scored = scored_datasets.get(upload_key)
+            df_upload = scored.frame if scored is not None else read_table(uploaded_file, fmt, columns=read_columns)
 
             st.subheader("📋 Uploaded Data Preview")
-            st.dataframe(df_upload.head(10))
+            st.dataframe(df_upload.head(10).drop(columns=['lead_score', 'lead_category'], errors='ignore'))
 
             # Check required columns
-            required_columns = [
-                'location_score', 'how_you_know_us_score', 'sibling_in_school_score',
-                'previous_school_name_score', 'class_applied_for_score',
-                'last_class_percentage_score', 'communication_email_different_score',
-                'whatsapp_number_different_score'
-            ]
+            required_columns = FEATURE_COLUMNS
 
             missing_columns = [col for col in required_columns if col not in df_upload.columns]
 
@@ -529,36 +312,20 @@ with tab3:
 
             else:
                 # Calculate scores
-                df_upload['lead_score'] = df_upload.apply(lambda row: calculate_lead_score(
-                    row['location_score'], row['how_you_know_us_score'],
-                    row['sibling_in_school_score'], row['previous_school_name_score'],
-                    row['class_applied_for_score'], row['last_class_percentage_score'],
-                    row['communication_email_different_score'], row['whatsapp_number_different_score']
-                ), axis=1)
-
-                df_upload['lead_category'] = df_upload['lead_score'].apply(categorize_lead)
+                if scored is None:
+                    scored = scored_datasets.put(upload_key, ScoredDataset.from_frame(df_upload, model))
 
                 # Display results
                 st.success("✅ Successfully processed your data!")
+                data_quality_notes(scored)
 
                 # Summary
-                col1, col2, col3, col4 = st.columns(4)
-                with col1:
-                    st.metric("Total Records", len(df_upload))
-                with col2:
-                    st.metric("Average Score", f"{df_upload['lead_score'].mean():.1f}")
-                with col3:
-                    st.metric("Hot Leads", len(df_upload[df_upload['lead_category'] == '🔥 Hot Lead']))
-                with col4:
-                    st.metric("Warm Leads", len(df_upload[df_upload['lead_category'] == '🟡 Warm Lead']))
+                summary_metrics(scored.stats, total_label="Total Records")
 
                 # Results table
                 st.subheader("📊 Scoring Results")
-                st.dataframe(df_upload, use_container_width=True)
-
-                # Download results
-                results_csv = df_upload.to_csv(index=False)
-                st.download_button("📥 Download Results", results_csv, "lead_scoring_results.csv", "text/csv")
+                paginated_results(df_upload, scored.index, key="upload_results",
+                                  download_label="📥 Download Results")
 
         except Exception as e:
             st.error(f"❌ Error processing file: {str(e)}")
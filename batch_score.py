@@ -0,0 +1,11 @@
+"""Nightly batch scoring: score lead exports in parallel and write a JSON summary.
+
+    python batch_score.py exports/*.parquet --output-dir scored/ --workers 8 --summary summary.json
+"""
+
+import sys
+
+from scoring.batch import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,472 @@
+"""Benchmarks for scoring, aggregation and the chat pipeline, recorded per run to spot regressions.
+
+Run the full suite for a release and compare the next one against it:
+
+    python benchmark.py --output benchmarks/v1.4.json
+    python benchmark.py --compare benchmarks/v1.4.json --output benchmarks/v1.5.json
+
+Quick runs pick sizes and benchmarks, e.g. --sizes 1k,100k -k scoring.
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+from scoring import (
+    FEATURE_COLUMNS, STANDARD_MODEL, LeadStats, ScoreIndex, calculate_lead_score, export_rows, generate_leads
+)
+
+# Dataset sizes of a full run
+DEFAULT_SIZES = "1k,100k,1M,10M"
+
+# Seed of every generated dataset, so runs compare like with like
+DEFAULT_SEED = 42
+
+# Timed runs per benchmark (the first is dropped as warm-up when there is more than one),
+# and the time after which no further runs are started
+DEFAULT_REPEAT = 5
+DEFAULT_MAX_SECONDS = 10.0
+
+# Medians this much slower than the compared run are reported as regressions
+DEFAULT_REGRESSION_RATIO = 1.25
+
+# Record-shaped (data.json) datasets are lists of dicts; larger sizes are capped to this
+DEFAULT_MAX_RECORD_ROWS = 100_000
+
+# Page size served by the stubbed leads API
+STUB_PAGE_SIZE = 1000
+
+SIZE_SUFFIXES = {'k': 1_000, 'm': 1_000_000}
+
+# Registered benchmarks, in run order
+BENCHMARKS = []
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable
+    # Calls per timed run; results are reported per call
+    number: int = 1
+    # Largest dataset the benchmark runs on (None: every size)
+    max_rows: Optional[int] = None
+    # Run once, not per dataset size
+    per_size: bool = True
+    # Reads the data.json shaped records rather than the frame
+    records: bool = False
+
+
+@dataclass
+class Result:
+    name: str
+    rows: int
+    runs: int
+    number: int
+    min: float
+    median: float
+    mean: float
+    rows_per_second: Optional[float] = None
+
+
+def benchmark(name, **options):
+    """Register a setup function returning the zero-argument callable to time"""
+    def register(setup):
+        BENCHMARKS.append(Benchmark(name=name, setup=setup, **options))
+        return setup
+    return register
+
+
+def parse_size(text):
+    text = text.strip().lower().replace('_', '')
+    multiplier = SIZE_SUFFIXES.get(text[-1:], 1)
+    return int(float(text.rstrip('km')) * multiplier)
+
+
+def format_size(rows):
+    for suffix, multiplier in (('M', 1_000_000), ('k', 1_000)):
+        if rows >= multiplier and rows % multiplier == 0:
+            return f"{rows // multiplier}{suffix}"
+    return str(rows)
+
+
+class Datasets:
+    """Inputs of one dataset size, built on first use and shared by the benchmarks"""
+
+    def __init__(self, rows, seed=DEFAULT_SEED, max_record_rows=DEFAULT_MAX_RECORD_ROWS):
+        self.rows = rows
+        self.seed = seed
+        self.record_rows = min(rows, max_record_rows)
+        self._cache = {}
+
+    def _get(self, key, build):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    @property
+    def frame(self):
+        """Synthetic ENTAB leads with their feature scores"""
+        return self._get('frame', lambda: generate_leads(self.rows, seed=self.seed, today='2025-01-01'))
+
+    @property
+    def scored(self):
+        def build():
+            df = self.frame.copy()
+            df['lead_score'] = STANDARD_MODEL.score(df)
+            df['lead_category'] = STANDARD_MODEL.categorize(df['lead_score'])
+            return df
+        return self._get('scored', build)
+
+    @property
+    def csv(self):
+        return self._get('csv', lambda: self.frame.to_csv(index=False).encode())
+
+    @property
+    def records(self):
+        """Leads shaped like the API's (data.json), resampled from its records with unique ids"""
+        def build():
+            with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data.json')) as f:
+                base = json.load(f)['leads']
+            picks = np.random.default_rng(self.seed).integers(0, len(base), self.record_rows)
+            return [dict(base[pick], _id=f"{i:024x}") for i, pick in enumerate(picks.tolist())]
+        return self._get('records', build)
+
+
+# Scoring
+
+@benchmark("scoring.single_row", number=1000, per_size=False)
+def bench_single_row(data):
+    features = data.frame[FEATURE_COLUMNS].iloc[0].tolist()
+    return lambda: calculate_lead_score(*features)
+
+
+def _row_lead_score(location_score, how_you_know_us_score, sibling_in_school_score,
+                    previous_school_name_score, class_applied_for_score,
+                    last_class_percentage_score, communication_email_different_score,
+                    whatsapp_number_different_score):
+    """The pure-Python weighted formula the dashboards applied per row before bulk scoring"""
+    weights = [0.85, 0.70, 0.95, 0.55, 0.50, 0.25, 0.25, 0.20]
+    scores = [location_score, how_you_know_us_score, sibling_in_school_score,
+              previous_school_name_score, class_applied_for_score,
+              last_class_percentage_score, communication_email_different_score,
+              whatsapp_number_different_score]
+    weighted_sum = sum(score * weight for score, weight in zip(scores, weights))
+    return weighted_sum / sum(weights)
+
+
+@benchmark("scoring.apply", max_rows=100_000)
+def bench_apply(data):
+    # The row-at-a-time path the dashboards used before bulk scoring
+    df = data.frame[FEATURE_COLUMNS]
+    return lambda: df.apply(lambda row: _row_lead_score(**row), axis=1)
+
+
+@benchmark("scoring.bulk")
+def bench_bulk(data):
+    df = data.frame
+    return lambda: STANDARD_MODEL.score(df)
+
+
+@benchmark("scoring.categorize")
+def bench_categorize(data):
+    scores = data.scored['lead_score'].to_numpy()
+    return lambda: STANDARD_MODEL.categorize(scores)
+
+
+# Filtering
+
+@benchmark("filter.mask")
+def bench_filter_mask(data):
+    df = data.scored
+    return lambda: df[df['lead_score'].between(60, 90) & (df['lead_category'] == STANDARD_MODEL.warm_label)]
+
+
+@benchmark("filter.index")
+def bench_filter_index(data):
+    df = data.scored
+    index = ScoreIndex.from_frame(df)
+    return lambda: index.select(df, lo=60, hi=90, lead_category=STANDARD_MODEL.warm_label)
+
+
+# Correlation
+
+@benchmark("correlation.one_pass")
+def bench_correlation_one_pass(data):
+    df = data.scored
+    return lambda: LeadStats.from_frame(df).feature_correlation_matrix()
+
+
+@benchmark("correlation.pandas")
+def bench_correlation_pandas(data):
+    df = data.scored[FEATURE_COLUMNS + ['lead_score']]
+    return lambda: df.corr()
+
+
+# CSV
+
+@benchmark("csv.parse")
+def bench_csv_parse(data):
+    body = data.csv
+    return lambda: pd.read_csv(io.BytesIO(body))
+
+
+@benchmark("csv.serialize")
+def bench_csv_serialize(data):
+    df = data.scored
+    return lambda: export_rows(df, fmt='csv').close()
+
+
+# Chat pipeline (main.py), with the leads API and Gemini stubbed out
+
+def _load_api():
+    # Importing main must not create or sync the local lead store
+    os.environ.setdefault('ENTAB_STORE_PATH', '')
+    import main
+    return main
+
+
+class StubUpstream:
+    """Serves pre-serialized pages of records in place of the external leads API"""
+
+    def __init__(self, records, page_size=STUB_PAGE_SIZE):
+        self.page_size = page_size
+        total = len(records)
+        self.pages = [json.dumps({"data": records[start:start + page_size], "total": total}).encode()
+                      for start in range(0, max(total, 1), page_size)]
+        self.requests = 0
+
+    async def get(self, url, params=None, headers=None, timeout=None):
+        self.requests += 1
+        page = int((params or {}).get('page', 1))
+        body = self.pages[page - 1] if 0 < page <= len(self.pages) else json.dumps({"data": []}).encode()
+        return _response(url, body)
+
+
+def _response(url, body):
+    import httpx
+    return httpx.Response(200, content=body, headers={'content-type': 'application/json'},
+                          request=httpx.Request('GET', url))
+
+
+class StubMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+class StubModel:
+    """Answers instantly, so the benchmark measures the pipeline around the LLM"""
+
+    async def ainvoke(self, prompt):
+        return StubMessage(f"Stub answer to a {len(prompt)} character prompt")
+
+    async def astream(self, prompt):
+        yield StubMessage("Stub answer")
+
+
+def _chat_setup(data, query):
+    main = _load_api()
+    upstream = StubUpstream(data.records)
+    main.http_client = upstream
+    main.model = StubModel()
+    os.environ['ENTAB_PAGE_SIZE'] = str(upstream.page_size)
+    os.environ['ENTAB_MAX_PAGES'] = str(len(upstream.pages))
+
+    import httpx
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://benchmark")
+
+    async def post():
+        # Every call is a cold one: no cached upstream responses or answers
+        main.student_data_cache.clear()
+        main.response_cache.clear()
+        response = await client.post('/chat', data={'user_input': query})
+        response.raise_for_status()
+        return response
+
+    return lambda: loop.run_until_complete(post())
+
+
+@benchmark("insights.generate", records=True)
+def bench_insights(data):
+    main = _load_api()
+    payload = {"data": data.records, "total": len(data.records)}
+    return lambda: main.generate_data_insights(payload, "How many female students came from the website?")
+
+
+@benchmark("chat.llm", records=True)
+def bench_chat_llm(data):
+    return _chat_setup(data, "Why are website leads low this year?")
+
+
+@benchmark("chat.direct", records=True)
+def bench_chat_direct(data):
+    return _chat_setup(data, "How many leads came from website?")
+
+
+def measure(fn, repeat=DEFAULT_REPEAT, number=1, max_seconds=DEFAULT_MAX_SECONDS):
+    """Seconds per call of each timed run, the warm-up run dropped when there are several"""
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < repeat + 1:
+        run_started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - run_started) / number)
+        if time.perf_counter() - started > max_seconds:
+            break
+    return timings[1:] if len(timings) > 1 else timings
+
+
+def run_benchmarks(sizes, pattern=None, repeat=DEFAULT_REPEAT, max_seconds=DEFAULT_MAX_SECONDS,
+                   seed=DEFAULT_SEED, max_record_rows=DEFAULT_MAX_RECORD_ROWS, log=sys.stderr):
+    selected = [bench for bench in BENCHMARKS if pattern is None or re.search(pattern, bench.name)]
+    results = []
+    done_once = set()
+    for rows in sizes:
+        # One size at a time, so only its datasets are held in memory
+        data = Datasets(rows, seed=seed, max_record_rows=max_record_rows)
+        for bench in selected:
+            if bench.max_rows is not None and rows > bench.max_rows:
+                continue
+            if not bench.per_size:
+                if bench.name in done_once:
+                    continue
+                done_once.add(bench.name)
+            bench_rows = data.record_rows if bench.records else rows
+            if bench.records and any(r.name == bench.name and r.rows == bench_rows for r in results):
+                continue
+
+            try:
+                fn = bench.setup(data)
+                timings = measure(fn, repeat=repeat, number=bench.number, max_seconds=max_seconds)
+            except ImportError as e:
+                print(f"Skipping {bench.name}: {e}", file=log)
+                done_once.add(bench.name)
+                continue
+
+            median = statistics.median(timings)
+            result = Result(
+                name=bench.name,
+                rows=bench_rows if bench.per_size else 1,
+                runs=len(timings),
+                number=bench.number,
+                min=min(timings),
+                median=median,
+                mean=statistics.fmean(timings),
+                rows_per_second=bench_rows / median if bench.per_size and median > 0 else None
+            )
+            results.append(result)
+            print(format_result(result), file=log)
+    return results
+
+
+def format_result(result, baseline=None):
+    line = f"{result.name:<24} {format_size(result.rows):>6} {format_seconds(result.median):>10}"
+    if result.rows_per_second:
+        line += f" {result.rows_per_second:>14,.0f} rows/s"
+    if baseline is not None:
+        line += f"   {result.median / baseline.median:5.2f}x vs baseline"
+    return line
+
+
+def format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale or unit == 'us':
+            return f"{seconds / scale:.2f} {unit}"
+
+
+def run_metadata(seed):
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": seed,
+    }
+
+
+def load_results(path):
+    with open(path) as f:
+        report = json.load(f)
+    return {(item['name'], item['rows']): Result(**item) for item in report['results']}
+
+
+def compare(results, baseline, ratio=DEFAULT_REGRESSION_RATIO):
+    """Results whose median is more than ratio times the baseline's, with the baseline result"""
+    regressions = []
+    for result in results:
+        before = baseline.get((result.name, result.rows))
+        if before is not None and before.median > 0 and result.median / before.median > ratio:
+            regressions.append((result, before))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark scoring, aggregation and the chat pipeline.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="dataset sizes, e.g. 1k,100k,1M,10M")
+    parser.add_argument("-k", "--filter", dest="pattern", help="only benchmarks whose name matches this regex")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--max-seconds", type=float, default=DEFAULT_MAX_SECONDS,
+                        help="start no further runs of a benchmark after this long")
+    parser.add_argument("--max-record-rows", type=int, default=DEFAULT_MAX_RECORD_ROWS,
+                        help="cap on the size of the data.json shaped datasets")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", help="write the results as JSON here")
+    parser.add_argument("--compare", help="results JSON of an earlier run to compare against")
+    parser.add_argument("--regression-ratio", type=float, default=DEFAULT_REGRESSION_RATIO)
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for bench in BENCHMARKS:
+            print(bench.name)
+        return 0
+
+    sizes = sorted({parse_size(size) for size in args.sizes.split(',') if size.strip()})
+    baseline = load_results(args.compare) if args.compare else None
+    results = run_benchmarks(sizes, pattern=args.pattern, repeat=args.repeat, max_seconds=args.max_seconds,
+                             seed=args.seed, max_record_rows=args.max_record_rows)
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump({"meta": run_metadata(args.seed), "results": [asdict(r) for r in results]}, f, indent=2)
+
+    if baseline is None:
+        return 0
+
+    print("\nCompared with " + args.compare)
+    for result in results:
+        print(format_result(result, baseline.get((result.name, result.rows))))
+    regressions = compare(results, baseline, ratio=args.regression_ratio)
+    for result, before in regressions:
+        print(f"Regression: {result.name} at {format_size(result.rows)} rows is "
+              f"{result.median / before.median:.2f}x slower ({format_seconds(before.median)} → "
+              f"{format_seconds(result.median)})", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
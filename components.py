@@ -0,0 +1,298 @@
+import math
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from scoring.engine import FEATURE_COLUMNS
+from scoring.export import EXPORT_FORMATS, export_rows
+from scoring.io import detect_format, projected_columns, read_column_names
+from scoring.stream import MissingColumnsError, score_file_stream
+
+# Uploads larger than this are scored in streaming mode by default
+STREAMING_THRESHOLD_BYTES = 50 * 1024 * 1024
+
+PAGE_SIZE_OPTIONS = [25, 50, 100, 250]
+
+SORT_OPTIONS = {
+    "Original order": None,
+    "Score (high to low)": "desc",
+    "Score (low to high)": "asc",
+}
+
+
+def category_pie(stats, title="Lead Categories Distribution"):
+    """Pie chart of lead categories from accumulated LeadStats"""
+    model = stats.model
+    fig_pie = px.pie(
+        values=stats.category_counts,
+        names=list(model.labels),
+        title=title,
+        color=list(model.labels),
+        color_discrete_map=model.color_map
+    )
+    fig_pie.update_traces(textposition='inside', textinfo='percent+label')
+    return fig_pie
+
+
+def score_histogram(stats, title="Lead Score Distribution"):
+    """Stacked score histogram from the fixed bins of accumulated LeadStats"""
+    model = stats.model
+    edges = stats.bin_edges
+    centers = (edges[:-1] + edges[1:]) / 2
+    hist_df = pd.DataFrame({
+        'lead_score': list(centers) * 3,
+        'Count': stats.histogram.ravel(),
+        'lead_category': [label for label in model.labels for _ in centers]
+    })
+    fig_hist = px.bar(
+        hist_df,
+        x='lead_score',
+        y='Count',
+        title=title,
+        color='lead_category',
+        color_discrete_map=model.color_map
+    )
+    fig_hist.update_traces(width=edges[1] - edges[0])
+    fig_hist.update_layout(xaxis_title="Lead Score", yaxis_title="Count", bargap=0)
+    return fig_hist
+
+
+def feature_label(col):
+    return col.replace('_', ' ').title()
+
+
+# Ways the feature analysis can compute the feature vs score correlations
+CORRELATION_SOURCES = {
+    "Measured from scores": False,
+    "Derived from weights and feature covariance": True,
+}
+
+
+def feature_correlation_bar(stats, derived=False, title="Feature Correlation with Lead Score"):
+    """Bar chart of each feature's correlation with the lead score, from LeadStats"""
+    correlations = stats.weighted_feature_correlations() if derived else stats.feature_correlations()
+    corr_df = pd.DataFrame({
+        'Feature': [feature_label(col) for col in FEATURE_COLUMNS],
+        'Correlation': correlations
+    }).sort_values('Correlation', ascending=True)
+
+    return px.bar(
+        corr_df,
+        x='Correlation',
+        y='Feature',
+        orientation='h',
+        title=title,
+        color='Correlation',
+        color_continuous_scale='RdYlBu_r'
+    )
+
+
+def feature_correlation_heatmap(stats, title="Correlation Between Features"):
+    """Heatmap of the feature correlation matrix, from LeadStats"""
+    labels = [feature_label(col) for col in FEATURE_COLUMNS]
+    fig_heat = px.imshow(
+        stats.feature_correlation_matrix().round(2),
+        x=labels,
+        y=labels,
+        zmin=-1,
+        zmax=1,
+        text_auto=True,
+        color_continuous_scale='RdBu_r',
+        title=title
+    )
+    return fig_heat
+
+
+def feature_contribution_bar(stats, title="What Drives the Average Score"):
+    """Points of the average lead score contributed by each feature (weight x mean / total weight)"""
+    contributions = stats.feature_contributions()
+    total = contributions.sum()
+    contrib_df = pd.DataFrame({
+        'Feature': [feature_label(col) for col in FEATURE_COLUMNS],
+        'Points': contributions,
+        'Share': contributions / total if total else contributions * 0
+    }).sort_values('Points', ascending=True)
+
+    fig_contrib = px.bar(
+        contrib_df,
+        x='Points',
+        y='Feature',
+        orientation='h',
+        title=title,
+        text=contrib_df['Share'].map("{:.0%}".format),
+        color='Points',
+        color_continuous_scale='Blues'
+    )
+    fig_contrib.update_layout(xaxis_title="Points of the average score")
+    return fig_contrib
+
+
+def feature_analysis(stats, key="feature_analysis"):
+    """Feature correlations, correlation matrix and score contributions, all from the cached LeadStats moments"""
+    st.subheader("🔍 Feature Analysis")
+    source = st.radio(
+        "Correlation source",
+        options=list(CORRELATION_SOURCES),
+        horizontal=True,
+        key=f"{key}_source",
+        help="Scores are a weighted sum of the features, so both give the same correlations "
+             "(up to the rounding some models apply to their scores)."
+    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(feature_correlation_bar(stats, derived=CORRELATION_SOURCES[source]),
+                        use_container_width=True)
+    with col2:
+        st.plotly_chart(feature_contribution_bar(stats), use_container_width=True)
+    st.plotly_chart(feature_correlation_heatmap(stats), use_container_width=True)
+
+
+def summary_metrics(stats, total_label="Total Students", hot_label="Hot Leads", warm_label="Warm Leads"):
+    """Four summary metrics rendered straight from LeadStats"""
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric(total_label, stats.count)
+    with col2:
+        st.metric("Average Score", f"{stats.mean:.1f}")
+    with col3:
+        st.metric(hot_label, stats.hot)
+    with col4:
+        st.metric(warm_label, stats.warm)
+
+
+def paginated_results(df, index, lo=None, hi=None, key="results", columns=None,
+                      file_name="lead_scoring_results", download_label="Download Results", **filters):
+    """
+    Show the rows matching a ScoreIndex query one page at a time, with lazy downloads.
+
+    Only the current page is sliced out of the frame and sent to the browser;
+    the full selection is only written out when a download button is clicked.
+    """
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        sort = SORT_OPTIONS[st.selectbox("Sort by", list(SORT_OPTIONS), key=f"{key}_sort")]
+    with col2:
+        page_size = st.selectbox("Rows per page", PAGE_SIZE_OPTIONS, index=1, key=f"{key}_page_size")
+
+    positions = index.query(lo, hi, sort_by_score=sort is not None, **filters)
+    if sort == "desc":
+        positions = positions[::-1]
+
+    total = len(positions)
+    pages = max(1, math.ceil(total / page_size))
+    page_key = f"{key}_page"
+    # Filters may have shrunk the selection below the page the user was on
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, step=1, key=page_key)
+
+    start = (page - 1) * page_size
+    page_rows = df.take(positions[start:start + page_size])
+    st.dataframe(page_rows[columns] if columns is not None else page_rows, use_container_width=True)
+    st.caption(f"Showing rows {min(start + 1, total):,}-{min(start + page_size, total):,} of {total:,}")
+
+    # Deferred downloads: the export runs only when its button is clicked
+    download_cols = st.columns(len(EXPORT_FORMATS))
+    for download_col, (fmt, (mime, extension)) in zip(download_cols, EXPORT_FORMATS.items()):
+        with download_col:
+            st.download_button(
+                label=f"{download_label} as {fmt.upper()}",
+                data=lambda fmt=fmt: export_rows(df, positions, fmt=fmt),
+                file_name=f"{file_name}{extension}",
+                mime=mime,
+                key=f"{key}_download_{fmt}"
+            )
+    return positions
+
+
+def upload_columns(uploaded_file, key):
+    """Detect an upload's format and let the user choose which non-score columns to read"""
+    fmt = detect_format(uploaded_file.name)
+    available = read_column_names(uploaded_file, fmt)
+    extra_columns = [col for col in available if col not in FEATURE_COLUMNS]
+    passthrough = st.multiselect(
+        "Extra columns to keep",
+        options=extra_columns,
+        default=extra_columns,
+        key=f"{key}_columns",
+        help="Columns besides the eight scores to read and carry into the results; "
+             "Parquet and Arrow files skip the others entirely"
+    )
+    return fmt, projected_columns(available, passthrough)
+
+
+def data_quality_notes(scored):
+    """Warn about invalid feature values and report the memory saved by compact dtypes"""
+    if scored.memory.out_of_range:
+        details = ", ".join(f"{col} ({count:,})" for col, count in scored.memory.out_of_range.items())
+        st.warning(f"Some feature scores are missing or outside 0-100 and were kept as-is: {details}")
+    st.caption(scored.memory.summary())
+
+
+def streaming_mode_toggle(uploaded_file, key):
+    """Checkbox for streaming mode, on by default for large uploads"""
+    return st.checkbox(
+        "Streaming mode (score in chunks, for large files)",
+        value=uploaded_file.size > STREAMING_THRESHOLD_BYTES,
+        key=key,
+        help="Reads, scores and writes the file chunk by chunk instead of loading it all at once"
+    )
+
+
+def show_streaming_analysis(uploaded_file, model, key, file_name="lead_scoring_results.csv"):
+    """Score an upload chunk by chunk and show its summary, charts and a streamed download"""
+    try:
+        return _show_streaming_analysis(uploaded_file, model, key, file_name)
+    except MissingColumnsError as e:
+        st.error(str(e))
+        st.info("Please ensure your file has all required columns with the exact names shown above.")
+    except Exception as e:
+        st.error(f"Error processing file: {str(e)}")
+    return None
+
+
+def _show_streaming_analysis(uploaded_file, model, key, file_name):
+    fmt, read_columns = upload_columns(uploaded_file, key)
+
+    # Keep the last result in session state so widget reruns don't re-score the file
+    state_key = f"{key}_stream_result"
+    token = (uploaded_file.file_id, tuple(read_columns))
+    cached = st.session_state.get(state_key)
+    if cached is not None and cached[0] == token:
+        result = cached[1]
+    else:
+        # A failed run leaves nothing behind: score_file_stream closes its partial spool
+        if cached is not None and cached[1].output is not None:
+            cached[1].output.close()
+        st.session_state.pop(state_key, None)
+        with st.spinner("Scoring file in chunks..."):
+            result = score_file_stream(uploaded_file, model=model, fmt=fmt, columns=read_columns)
+        st.session_state[state_key] = (token, result)
+
+    stats = result.stats
+
+    st.subheader("📋 Data Preview")
+    st.dataframe(result.preview)
+
+    st.subheader("📊 Summary Statistics")
+    summary_metrics(stats)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(category_pie(stats), use_container_width=True)
+    with col2:
+        st.plotly_chart(score_histogram(stats), use_container_width=True)
+
+    feature_analysis(stats, key=f"{key}_features")
+
+    # The scored rows live in a spooled temp file and are only read when clicked
+    st.download_button(
+        label="Download Results as CSV",
+        data=result.open_output,
+        file_name=file_name,
+        mime="text/csv",
+        key=f"{key}_stream_download"
+    )
+    return result
@@ -0,0 +1,11 @@
+"""Synthetic leads for demos and load tests.
+
+    python generate_leads.py 10000000 leads.parquet --seed 7
+"""
+
+import sys
+
+from scoring.synthetic import main
+
+if __name__ == "__main__":
+    sys.exit(main())
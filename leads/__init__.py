@@ -0,0 +1,21 @@
+"""Helpers behind the enquiry chatbot API: access to the Entab leads API and analysis of its records."""
+
+from leads.client import ClientSettings, PooledClient, http2_available
+from leads.cache import AsyncTTLCache, filter_key, is_cacheable
+from leads.insights import DEFAULT_DIMENSIONS, LeadAggregates
+from leads.paginate import LeadPaginator, UpstreamError, page_records, page_total
+from leads.store import LeadStore, record_watermark
+from leads.planner import QueryPlan, execute_plan, filter_records, known_values, mentioned_genders, plan_query
+from leads.prompt import PromptBuilder, PromptReport, estimate_tokens, rank_lines
+from leads.responses import ResponseCache, normalize_query, query_terms, value_terms
+
+__all__ = [
+    'ClientSettings', 'PooledClient', 'http2_available',
+    'AsyncTTLCache', 'filter_key', 'is_cacheable',
+    'DEFAULT_DIMENSIONS', 'LeadAggregates',
+    'LeadPaginator', 'UpstreamError', 'page_records', 'page_total',
+    'LeadStore', 'record_watermark',
+    'QueryPlan', 'execute_plan', 'filter_records', 'known_values', 'mentioned_genders', 'plan_query',
+    'PromptBuilder', 'PromptReport', 'estimate_tokens', 'rank_lines',
+    'ResponseCache', 'normalize_query', 'query_terms', 'value_terms',
+]
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict
+
+# Defaults for the upstream response cache
+DEFAULT_TTL_SECONDS = 60.0
+DEFAULT_STALE_SECONDS = 300.0
+DEFAULT_MAX_ENTRIES = 256
+
+
+def is_cacheable(value):
+    """Error dicts from fetch_student_data are never cached"""
+    return not (isinstance(value, dict) and "error" in value)
+
+
+def filter_key(params: Dict[str, Any]) -> str:
+    """Stable cache key for a normalized filter dict, independent of key order"""
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+class AsyncTTLCache:
+    """
+    Size-bounded LRU cache for async fetches with a TTL, stale-while-revalidate and single-flight.
+
+    A fresh entry is returned directly. Once it is older than ttl but still within
+    stale_ttl more seconds, it is returned as-is while one background refresh
+    replaces it. Concurrent misses for the same key share a single fetch.
+    Results rejected by cacheable (error responses) are returned but never stored.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL_SECONDS, stale_ttl=DEFAULT_STALE_SECONDS, max_entries=DEFAULT_MAX_ENTRIES,
+                 cacheable: Callable[[Any], bool] = is_cacheable, clock=time.monotonic):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.cacheable = cacheable
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._refreshes = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.uncacheable = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def clear(self):
+        self._entries.clear()
+
+    def _store(self, key, value):
+        if not self.cacheable(value):
+            self.uncacheable += 1
+            return
+        self._entries[key] = (value, self.clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _fetch_once(self, key, fetch: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        """The shared in-flight fetch for key, starting it if none is running"""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return task
+
+        async def run():
+            try:
+                value = await fetch()
+                self._store(key, value)
+                return value
+            finally:
+                self._inflight.pop(key, None)
+
+        task = asyncio.ensure_future(run())
+        self._inflight[key] = task
+        return task
+
+    def _refresh(self, key, fetch):
+        if key in self._inflight:
+            return
+        self.refreshes += 1
+        task = self._fetch_once(key, fetch)
+        # Keep a reference so the background refresh is not garbage collected mid-flight
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+    async def get_or_fetch(self, key, fetch: Callable[[], Awaitable[Any]]):
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, stored_at = entry
+            age = self.clock() - stored_at
+            if age <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            if age <= self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                self._refresh(key, fetch)
+                return value
+            del self._entries[key]
+
+        self.misses += 1
+        # Shielded so a cancelled caller does not cancel the fetch other callers are waiting on
+        return await asyncio.shield(self._fetch_once(key, fetch))
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "stale_seconds": self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "uncacheable": self.uncacheable,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else None
+        }
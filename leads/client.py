@@ -0,0 +1,156 @@
+import importlib.util
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+def _env_float(name, default):
+    return float(os.getenv(name, default))
+
+
+def http2_available():
+    """HTTP/2 needs the optional h2 package (pip install httpx[http2])"""
+    return importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class ClientSettings:
+    """Connection pool and timeout settings for the upstream leads API client"""
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    write_timeout: float = 10.0
+    pool_timeout: float = 5.0
+    http2: bool = True
+
+    @classmethod
+    def from_env(cls):
+        """Settings from ENTAB_HTTP_* environment variables, falling back to the defaults"""
+        defaults = cls()
+        return cls(
+            max_connections=_env_int("ENTAB_HTTP_MAX_CONNECTIONS", defaults.max_connections),
+            max_keepalive_connections=_env_int("ENTAB_HTTP_MAX_KEEPALIVE", defaults.max_keepalive_connections),
+            keepalive_expiry=_env_float("ENTAB_HTTP_KEEPALIVE_EXPIRY", defaults.keepalive_expiry),
+            connect_timeout=_env_float("ENTAB_HTTP_CONNECT_TIMEOUT", defaults.connect_timeout),
+            read_timeout=_env_float("ENTAB_HTTP_READ_TIMEOUT", defaults.read_timeout),
+            write_timeout=_env_float("ENTAB_HTTP_WRITE_TIMEOUT", defaults.write_timeout),
+            pool_timeout=_env_float("ENTAB_HTTP_POOL_TIMEOUT", defaults.pool_timeout),
+            http2=os.getenv("ENTAB_HTTP2", "1").lower() not in ("0", "false", "no"),
+        )
+
+    @property
+    def limits(self):
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+    @property
+    def timeout(self):
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout
+        )
+
+
+class PooledClient:
+    """
+    One long-lived httpx.AsyncClient shared by every request of the app.
+
+    Connections to the upstream API are kept alive and reused, so a request only
+    pays DNS, TCP and TLS setup when the pool has no idle connection. The client
+    is opened at startup and closed at shutdown; it is also opened lazily on
+    first use so the module works without the app lifespan (e.g. in scripts).
+    """
+
+    def __init__(self, settings: ClientSettings = None, headers: Optional[Dict[str, str]] = None):
+        self.settings = settings or ClientSettings.from_env()
+        self.headers = headers or {}
+        self._client = None
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_seconds = 0.0
+
+    @property
+    def http2(self):
+        return self.settings.http2 and http2_available()
+
+    @property
+    def is_open(self):
+        return self._client is not None and not self._client.is_closed
+
+    def start(self):
+        if not self.is_open:
+            self._client = httpx.AsyncClient(
+                limits=self.settings.limits,
+                timeout=self.settings.timeout,
+                http2=self.http2,
+                headers=self.headers
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(self, url: str, params: Dict[str, Any] = None, headers: Dict[str, str] = None,
+                  timeout: Optional[float] = None) -> httpx.Response:
+        """GET through the shared pool; timeout overrides the read timeout for this request only"""
+        client = self.start()
+        request_timeout = httpx.USE_CLIENT_DEFAULT if timeout is None else \
+            httpx.Timeout(timeout, connect=self.settings.connect_timeout, pool=self.settings.pool_timeout)
+
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        started = time.perf_counter()
+        try:
+            return await client.get(url, params=params, headers=headers, timeout=request_timeout)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self.total_seconds += time.perf_counter() - started
+
+    def _pool_connections(self):
+        # httpx does not expose its pool; read the httpcore connection list when it is there
+        transport = getattr(self._client, "_transport", None)
+        return list(getattr(getattr(transport, "_pool", None), "connections", []))
+
+    def metrics(self) -> Dict[str, Any]:
+        """Pool utilization and request counters, for /health"""
+        connections = self._pool_connections() if self.is_open else []
+        idle = sum(1 for connection in connections if connection.is_idle())
+        active = len(connections) - idle
+        return {
+            "open": self.is_open,
+            "http2": self.http2,
+            "max_connections": self.settings.max_connections,
+            "max_keepalive_connections": self.settings.max_keepalive_connections,
+            "connections": len(connections),
+            "active_connections": active,
+            "idle_connections": idle,
+            "utilization": round(active / self.settings.max_connections, 3),
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_latency_ms": round(1000 * self.total_seconds / self.requests, 1) if self.requests else None
+        }
@@ -0,0 +1,101 @@
+import heapq
+import json
+from collections import Counter
+from operator import itemgetter
+from typing import Any, AsyncIterable, Dict, Iterable, List, Tuple
+
+# Lead fields counted by default
+DEFAULT_DIMENSIONS = (
+    'gender', 'schoolCode', 'class', 'location', 'appliedYear',
+    'source', 'status', 'counsellor', 'howYouKnowUs'
+)
+
+# Value counted for records that lack a field
+MISSING = 'Unknown'
+
+# Keys used to label structured values, e.g. a location given as {"city": ..., "address": ...}
+LABEL_KEYS = ('city', 'name', 'label', 'value')
+
+
+def hashable_value(value):
+    """A countable stand-in for dict and list values: their label key, or their JSON text"""
+    if isinstance(value, dict):
+        for key in LABEL_KEYS:
+            if isinstance(value.get(key), (str, int, float)):
+                return value[key]
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, default=str)
+    return value
+
+
+class LeadAggregates:
+    """
+    Group-by counts of lead records over any number of fields.
+
+    Each batch of records is transposed into one column per field and each column
+    counted with Counter, so the per-record work happens in C rather than in a
+    Python loop with a dict update per field. Batches can be added one at a time (e.g. pages
+    as they arrive) and aggregates from different sources merged.
+    """
+
+    def __init__(self, dimensions: Iterable[str] = DEFAULT_DIMENSIONS):
+        self.dimensions = tuple(dimensions)
+        self.counts = {dimension: Counter() for dimension in self.dimensions}
+        self.total = 0
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]], dimensions: Iterable[str] = DEFAULT_DIMENSIONS):
+        aggregates = cls(dimensions)
+        aggregates.update(records)
+        return aggregates
+
+    @classmethod
+    async def from_stream(cls, pages: AsyncIterable[List[Dict[str, Any]]],
+                          dimensions: Iterable[str] = DEFAULT_DIMENSIONS):
+        """Aggregate an async stream of record batches, such as LeadPaginator.pages()"""
+        aggregates = cls(dimensions)
+        async for page in pages:
+            aggregates.update(page)
+        return aggregates
+
+    def update(self, records: Iterable[Dict[str, Any]]):
+        records = records if isinstance(records, list) else list(records)
+        for dimension, column in zip(self.dimensions, self._columns(records)):
+            try:
+                counts = Counter(column)
+            except TypeError:
+                # Some values are dicts or lists
+                counts = Counter(map(hashable_value, column))
+            if self.counts[dimension]:
+                self.counts[dimension].update(counts)
+            else:
+                self.counts[dimension] = counts
+        self.total += len(records)
+        return self
+
+    def _columns(self, records):
+        """One value list per dimension, transposed in C when every record has every field"""
+        if len(self.dimensions) > 1:
+            try:
+                return zip(*map(itemgetter(*self.dimensions), records))
+            except KeyError:
+                pass
+        return ([record.get(dimension, MISSING) for record in records] for dimension in self.dimensions)
+
+    def merge(self, other: "LeadAggregates"):
+        if other.dimensions != self.dimensions:
+            raise ValueError("Cannot merge aggregates over different dimensions")
+        for dimension in self.dimensions:
+            self.counts[dimension].update(other.counts[dimension])
+        self.total += other.total
+        return self
+
+    def count(self, dimension: str, value: Any) -> int:
+        return self.counts[dimension][value]
+
+    def distinct(self, dimension: str) -> int:
+        return len(self.counts[dimension])
+
+    def top(self, dimension: str, k: int = 3) -> List[Tuple[Any, int]]:
+        """The k most frequent values with their counts; ties keep first-seen order"""
+        return heapq.nlargest(k, self.counts[dimension].items(), key=itemgetter(1))
@@ -0,0 +1,213 @@
+import asyncio
+import hashlib
+import logging
+import random
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+# Defaults for walking the leads API page by page
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_CONCURRENCY = 6
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_SECONDS = 0.5
+DEFAULT_MAX_PAGES = 200
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying: rate limiting and server-side failures
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class UpstreamError(Exception):
+    """A page request that still failed after its retries"""
+
+    def __init__(self, message, status=None, body=None):
+        super().__init__(message)
+        self.status = status
+        self.body = body
+
+
+def page_records(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Lead records of one response page, which the API returns under 'data' or 'leads'"""
+    for key in ('data', 'leads'):
+        if isinstance(payload.get(key), list):
+            return payload[key]
+    return []
+
+
+def page_total(payload: Dict[str, Any]) -> Optional[int]:
+    """Total number of matching leads, if the response reports it"""
+    for container in (payload, payload.get('pagination'), payload.get('meta')):
+        if isinstance(container, dict):
+            for key in ('total', 'totalCount', 'count'):
+                if isinstance(container.get(key), int):
+                    return container[key]
+    return None
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class LeadPaginator:
+    """
+    Fetch every page of a leads query with bounded concurrency, retries and backoff.
+
+    The first page is fetched alone to discover the total and how many records the
+    API serves a page (which may be fewer than page_size); the remaining pages are
+    then requested concurrently (at most concurrency at a time) and yielded in page
+    order as they complete. When the API does not report a total, pages are
+    requested a window at a time until a short or empty page comes back.
+    """
+
+    def __init__(self, client, url: str, headers: Dict[str, str] = None, page_size=DEFAULT_PAGE_SIZE,
+                 concurrency=DEFAULT_CONCURRENCY, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff_seconds=DEFAULT_BACKOFF_SECONDS, max_pages=DEFAULT_MAX_PAGES,
+                 page_param='page', size_param='limit', first_page=1):
+        self.client = client
+        self.url = url
+        self.headers = headers or {}
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_pages = max_pages
+        self.page_param = page_param
+        self.size_param = size_param
+        self.first_page = first_page
+        # Set when the last walk stopped at max_pages with more leads left upstream
+        self.truncated = False
+        # Records a page the API actually served on the last walk, at most page_size
+        self.per_page = page_size
+
+    async def fetch_page(self, params: Dict[str, Any], page: int) -> httpx.Response:
+        """One page, retried with exponential backoff and jitter on transport errors, 429 and 5xx"""
+        page_params = {**params, self.page_param: page, self.size_param: self.page_size}
+        for attempt in range(self.max_retries + 1):
+            delay = None
+            try:
+                response = await self.client.get(self.url, params=page_params, headers=self.headers)
+            except httpx.TransportError as e:
+                if attempt == self.max_retries:
+                    raise UpstreamError(f"Page {page} failed: {type(e).__name__}") from e
+            else:
+                if response.status_code == 200:
+                    return response
+                if response.status_code not in RETRY_STATUS or attempt == self.max_retries:
+                    raise UpstreamError(f"API request failed with status {response.status_code}",
+                                        status=response.status_code, body=response.text)
+                delay = _retry_after(response)
+
+            if delay is None:
+                delay = self.backoff_seconds * 2 ** attempt + random.uniform(0, self.backoff_seconds)
+            await asyncio.sleep(delay)
+
+    async def _window(self, params, pages, semaphore):
+        async def fetch(page):
+            async with semaphore:
+                return await self.fetch_page(params, page)
+
+        tasks = [asyncio.ensure_future(fetch(page)) for page in pages]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def responses(self, params: Dict[str, Any] = None, skip_pages=0,
+                        per_page: Optional[int] = None) -> AsyncIterator[httpx.Response]:
+        """
+        Raw page responses, in page order, starting skip_pages pages in to resume an
+        earlier walk that received per_page records a page (that walk's self.per_page)
+        """
+        params = dict(params or {})
+        self.truncated = False
+        self.per_page = per_page or self.page_size
+        start_page = self.first_page + skip_pages
+        first = await self.fetch_page(params, start_page)
+        yield first
+
+        payload = first.json()
+        records = page_records(payload)
+        total = page_total(payload)
+        if not records or (total is None and len(records) < self.page_size):
+            return
+        # An API may serve fewer records a page than asked for; the first page shows how many
+        if total is not None and skip_pages == 0 and per_page is None:
+            self.per_page = min(len(records), self.page_size)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        last_page = start_page + self.max_pages - 1
+        first_id = records[0].get('_id') if records and isinstance(records[0], dict) else None
+
+        if total is not None:
+            page_count = -(-total // self.per_page) - skip_pages
+            if page_count > self.max_pages:
+                self._truncate(f"{total} leads need {page_count + skip_pages} pages")
+                page_count = self.max_pages
+            async for response in self._window(params, range(start_page + 1, start_page + page_count),
+                                               semaphore):
+                yield response
+            return
+
+        # Unknown total: probe a window of pages at a time until one comes back short
+        next_page = start_page + 1
+        while next_page <= last_page:
+            window = range(next_page, min(next_page + self.concurrency, last_page + 1))
+            async for response in self._window(params, window, semaphore):
+                records = page_records(response.json())
+                # An API that ignores the page parameter serves page one again
+                if records and isinstance(records[0], dict) and first_id is not None \
+                        and records[0].get('_id') == first_id:
+                    return
+                yield response
+                if len(records) < self.page_size:
+                    return
+            next_page = window.stop
+        self._truncate("the last page fetched was still full")
+
+    def _truncate(self, reason):
+        self.truncated = True
+        logger.warning("Stopping at %d pages of %d leads (%s); the result is incomplete",
+                       self.max_pages, self.per_page, reason)
+
+    async def pages(self, params: Dict[str, Any] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Lead records a page at a time, in page order"""
+        async for response in self.responses(params):
+            yield page_records(response.json())
+
+    async def records(self, params: Dict[str, Any] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Every lead record of the query, as an async stream"""
+        async for page in self.pages(params):
+            for record in page:
+                yield record
+
+    async def collect(self, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        All pages combined into one payload shaped like a single API response, with a digest of the raw pages.
+        'truncated' is set when max_pages stopped the walk early; 'fetched' counts the records actually held.
+        """
+        digest = hashlib.blake2b(digest_size=8)
+        records = []
+        total = None
+        pages = 0
+        async for response in self.responses(params):
+            digest.update(response.content)
+            payload = response.json()
+            if total is None:
+                total = page_total(payload)
+            records.extend(page_records(payload))
+            pages += 1
+        return {
+            "data": records,
+            "total": total if total is not None else len(records),
+            "fetched": len(records),
+            "truncated": self.truncated,
+            "pages": pages,
+            "_snapshot": digest.hexdigest()
+        }
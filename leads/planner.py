@@ -0,0 +1,231 @@
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from leads.insights import LeadAggregates, hashable_value
+from leads.responses import STOPWORDS, normalize_query
+
+# Fields whose values are recognised when they appear in a question
+VALUE_FIELDS = ('class', 'schoolCode', 'source', 'howYouKnowUs', 'location')
+
+# How fields are named in answers
+FIELD_LABELS = {
+    'gender': 'gender',
+    'class': 'class',
+    'schoolCode': 'school',
+    'source': 'source',
+    'howYouKnowUs': 'referral channel',
+    'location': 'location',
+    'appliedYear': 'applied year',
+    'status': 'status',
+    'counsellor': 'counsellor',
+}
+
+# Words naming a field to group by ("by class", "per school", "gender wise")
+DIMENSION_WORDS = {
+    'gender': 'gender', 'sex': 'gender',
+    'class': 'class', 'grade': 'class', 'section': 'class',
+    'school': 'schoolCode', 'schoolcode': 'schoolCode', 'code': 'schoolCode',
+    'source': 'source', 'channel': 'source',
+    'referral': 'howYouKnowUs', 'howyouknowus': 'howYouKnowUs',
+    'location': 'location', 'city': 'location', 'area': 'location',
+    'year': 'appliedYear',
+    'status': 'status',
+    'counsellor': 'counsellor', 'counselor': 'counsellor',
+}
+
+GENDER_WORDS = {
+    'male': 'Male', 'males': 'Male', 'boy': 'Male', 'boys': 'Male',
+    'female': 'Female', 'females': 'Female', 'girl': 'Female', 'girls': 'Female',
+}
+
+COUNT_PHRASES = ('how many', 'number of', 'count', 'total')
+
+# Questions the rules should not try to answer
+OPEN_ENDED_WORDS = frozenset("""
+why suggest suggestion recommend recommendation compare comparison trend trends explain analyze analyse
+improve predict forecast should insight insights summary summarize summarise
+""".split())
+
+# Words that say nothing beyond "count leads"; time words ("year", "so far") and outcome words
+# ("enrolled", "admission") narrow the leads, so they are left out and such questions go to the LLM
+FILLER_WORDS = frozenset("""
+student students lead leads enquiry enquiries inquiry inquiries application applications applicant applicants
+record records child children kid kids applied apply applying came come
+have has got did with having each every break down breakdown distribution split most wise per by
+grade class std standard section total count number many who were are overall
+""".split())
+
+# Stopwords that still limit which leads are meant ("this year", "last month")
+TIME_WORDS = frozenset("this last week month".split())
+
+_YEAR = re.compile(r"^(19|20)\d{2}$")
+_CLASS_LEVEL = re.compile(r"^(\d{1,2}|kg|lkg|ukg|nursery)$")
+
+
+@dataclass
+class QueryPlan:
+    """A question mapped onto filters over lead fields plus a count or a per-value breakdown"""
+
+    intent: str
+    filters: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    group_by: Optional[str] = None
+
+    def describe(self):
+        parts = [f"{FIELD_LABELS.get(name, name)} {' or '.join(values)}"
+                 for name, values in self.filters.items()]
+        return ", ".join(parts)
+
+
+def mentioned_genders(query: str) -> List[str]:
+    """Genders named in a question, as whole words ("female" does not also mean "male")"""
+    genders = []
+    for word in normalize_query(query).split():
+        gender = GENDER_WORDS.get(word)
+        if gender and gender not in genders:
+            genders.append(gender)
+    return genders
+
+
+def known_values(records: List[Dict[str, Any]], fields: Iterable[str] = VALUE_FIELDS) -> Dict[str, List[str]]:
+    """Distinct values of each field in the data, which the planner can then recognise in questions"""
+    aggregates = LeadAggregates.from_records(records, dimensions=fields)
+    return {name: [str(value) for value in aggregates.counts[name]] for name in aggregates.dimensions}
+
+
+def _phrases(values: Dict[str, List[str]]):
+    """(words, field, value) for every known value, longest phrases first"""
+    phrases = []
+    for name, field_values in values.items():
+        for value in field_values:
+            words = tuple(normalize_query(value).split())
+            if words:
+                phrases.append((words, name, value))
+    return sorted(phrases, key=lambda phrase: len(phrase[0]), reverse=True)
+
+
+def plan_query(query: str, values: Dict[str, List[str]] = None) -> Optional[QueryPlan]:
+    """
+    Map a count or breakdown question onto a QueryPlan, or return None to leave it to the LLM.
+
+    Every content word of the question has to be understood (an intent word, a
+    gender, a year, a class, a known field value or filler), so questions with
+    conditions the rules cannot express are never answered with a wrong count.
+    """
+    normalized = normalize_query(query)
+    words = normalized.split()
+    if not words or OPEN_ENDED_WORDS.intersection(words):
+        return None
+
+    counting = any(f" {phrase} " in f" {normalized} " for phrase in COUNT_PHRASES)
+
+    filters = {}
+    group_by = None
+    used = [False] * len(words)
+
+    def add_filter(name, value):
+        filters.setdefault(name, {})[value.lower()] = value
+
+    def dimension_at(i):
+        if i >= len(words) or used[i]:
+            return None
+        word = words[i]
+        return DIMENSION_WORDS.get(word) or (DIMENSION_WORDS.get(word[:-1]) if word.endswith('s') else None)
+
+    def group_by_at(i):
+        """Group by the field named at position i, consuming a second field word ("referral channels")"""
+        used[i] = True
+        if dimension_at(i + 1):
+            used[i + 1] = True
+        return dimension_at(i) or DIMENSION_WORDS.get(words[i]) or DIMENSION_WORDS.get(words[i][:-1])
+
+    # Known multi-word values first ("social media", "friend referral"), longest match wins
+    for phrase_words, name, value in _phrases(values or {}):
+        n = len(phrase_words)
+        for i in range(len(words) - n + 1):
+            if tuple(words[i:i + n]) == phrase_words and not any(used[i:i + n]):
+                add_filter(name, value)
+                used[i:i + n] = [True] * n
+
+    class_values = (values or {}).get('class', [])
+    for i, word in enumerate(words):
+        if used[i]:
+            continue
+        if word in GENDER_WORDS:
+            add_filter('gender', GENDER_WORDS[word])
+        elif _YEAR.match(word):
+            add_filter('appliedYear', word)
+        elif word in ('class', 'grade', 'std', 'standard') and i + 1 < len(words) \
+                and _CLASS_LEVEL.match(words[i + 1]):
+            # "class 5" means every section of class 5 (5A, 5B, ...)
+            level = words[i + 1]
+            sections = [value for value in class_values
+                        if re.fullmatch(rf"{re.escape(level)}[a-z]?", value.lower())]
+            for value in sections or [level]:
+                add_filter('class', value)
+            used[i + 1] = True
+        elif word in ('by', 'per', 'which', 'what', 'top') and dimension_at(i + 1):
+            group_by = group_by_at(i + 1)
+        elif word == 'wise' and i > 0 and dimension_at(i - 1):
+            group_by = group_by_at(i - 1)
+        else:
+            continue
+        used[i] = True
+
+    # Both genders named: "how many male and female students" is a breakdown by gender
+    if len(filters.get('gender', {})) > 1 and group_by is None:
+        del filters['gender']
+        group_by = 'gender'
+
+    leftover = [word for word, is_used in zip(words, used)
+                if not is_used and (word not in STOPWORDS or word in TIME_WORDS) and word not in FILLER_WORDS
+                and word not in ('which', 'what', 'and')]
+    if leftover:
+        return None
+    if group_by is None and not counting:
+        return None
+
+    return QueryPlan(
+        intent='breakdown' if group_by else 'count',
+        filters={name: tuple(allowed.values()) for name, allowed in filters.items()},
+        group_by=group_by
+    )
+
+
+def _matches(record, filters):
+    for name, allowed in filters.items():
+        value = hashable_value(record.get(name))
+        if value is None or str(value).lower() not in allowed:
+            return False
+    return True
+
+
+def filter_records(records: List[Dict[str, Any]], filters: Dict[str, Tuple[str, ...]]) -> List[Dict[str, Any]]:
+    """Records whose fields take one of the allowed values, compared case-insensitively"""
+    if not filters:
+        return records
+    allowed = {name: {value.lower() for value in values} for name, values in filters.items()}
+    return [record for record in records if _matches(record, allowed)]
+
+
+def execute_plan(plan: QueryPlan, records: List[Dict[str, Any]], total: Optional[int] = None) -> str:
+    """Answer a plan from the lead records"""
+    matching = filter_records(records, plan.filters)
+    scope = f" with {plan.describe()}" if plan.filters else ""
+
+    if plan.intent == 'count':
+        answer = f"There are {len(matching)} leads{scope}."
+    else:
+        aggregates = LeadAggregates.from_records(matching, dimensions=[plan.group_by])
+        label = FIELD_LABELS.get(plan.group_by, plan.group_by)
+        if not matching:
+            answer = f"There are no leads{scope}."
+        else:
+            breakdown = "\n".join(f"- {value}: {count}" for value, count in aggregates.top(plan.group_by, 10))
+            shown = "" if aggregates.distinct(plan.group_by) <= 10 else \
+                f" (top 10 of {aggregates.distinct(plan.group_by)})"
+            answer = f"{len(matching)} leads{scope}, by {label}{shown}:\n{breakdown}"
+
+    if total is not None and total > len(records):
+        answer += f"\n\n(Based on the {len(records)} records loaded out of {total}.)"
+    return answer
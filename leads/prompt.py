@@ -0,0 +1,160 @@
+import json
+import math
+import textwrap
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Tuple
+
+from leads.responses import normalize_query, query_terms
+
+# Rough size of a Gemini token in characters of English text
+CHARS_PER_TOKEN = 4
+
+# Default budget for the whole chat prompt, in estimated tokens
+DEFAULT_PROMPT_TOKENS = 800
+
+# The user's question never takes more than this share of the budget
+MAX_QUERY_SHARE = 0.25
+
+# Nor do the applied filters
+MAX_FILTERS_SHARE = 0.25
+
+CHAT_TEMPLATE = textwrap.dedent("""\
+    You are a helpful assistant analyzing student application data.
+
+    User Query: {user_input}
+
+    Current Data Insights:
+    {insights}
+
+    Applied Filters: {filters}
+
+    Please provide a helpful, conversational response about the student data.
+    Keep it concise and relevant to the user's question. If they're asking for
+    specific information that's not in the insights, acknowledge what data is
+    available and suggest how they might refine their query or filters.
+    """)
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, tokens: int, separator: str = ", ") -> str:
+    """Cut text to about tokens, at the last separator that fits, marking the cut with an ellipsis"""
+    limit = tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(separator, 0, max(limit - 1, 0))
+    return (text[:cut] if cut > 0 else text[:max(limit - 1, 0)]).rstrip() + "…"
+
+
+def rank_lines(lines: List[str], query: str) -> List[int]:
+    """
+    Line positions, most relevant to the query first: by how many of the query's
+    content words a line shares; the first line (the record count) always leads
+    """
+    terms = set(query_terms(normalize_query(query)))
+
+    def relevance(position):
+        if position == 0:
+            return float('inf')
+        return len(terms.intersection(query_terms(normalize_query(lines[position]))))
+
+    return sorted(range(len(lines)), key=lambda position: (-relevance(position), position))
+
+
+@dataclass
+class PromptReport:
+    """Size of one built prompt against its budget"""
+
+    tokens: int
+    budget: int
+    insight_lines: int
+    insight_lines_kept: int
+    insight_lines_compacted: int
+    query_truncated: bool
+    filters_truncated: bool = False
+
+    @property
+    def truncated(self):
+        return self.query_truncated or self.filters_truncated or self.insight_lines_compacted > 0 \
+            or self.insight_lines_kept < self.insight_lines
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "truncated": self.truncated}
+
+
+class PromptBuilder:
+    """
+    Builds chat prompts that stay within a token budget however large the insights grow.
+
+    The fixed template, the question and the (compact) filters are placed first,
+    the question and filters each capped at a quarter of the budget; the insight
+    lines then fill the remaining budget in order of relevance to the question,
+    the last one cut short at an item boundary if it does not fit whole. Kept
+    lines stay in their original order.
+    """
+
+    def __init__(self, budget_tokens=DEFAULT_PROMPT_TOKENS, template=CHAT_TEMPLATE):
+        self.budget_tokens = budget_tokens
+        self.template = template
+        self.prompts = 0
+        self.total_tokens = 0
+        self.max_tokens = 0
+        self.truncated = 0
+
+    def build(self, user_input: str, insights: str, filters: Dict[str, Any] = None) -> Tuple[str, PromptReport]:
+        full_filters = json.dumps(filters, separators=(',', ':'), sort_keys=True, default=str) if filters else "None"
+        filters_text = truncate_to_tokens(full_filters, int(self.budget_tokens * MAX_FILTERS_SHARE), separator=",")
+        query = truncate_to_tokens(user_input.strip(), int(self.budget_tokens * MAX_QUERY_SHARE), separator=" ")
+        fixed = estimate_tokens(self.template.format(user_input=query, insights="", filters=filters_text))
+
+        lines = [line for line in insights.splitlines() if line.strip()]
+        available = self.budget_tokens - fixed
+        kept = {}
+        compacted = 0
+        for position in rank_lines(lines, user_input):
+            line = lines[position]
+            # +1 for the line break
+            cost = estimate_tokens(line) + 1
+            if cost <= available:
+                kept[position] = line
+                available -= cost
+            elif available > 8:
+                kept[position] = truncate_to_tokens(line, available - 1)
+                compacted += 1
+                available = 0
+            else:
+                break
+
+        prompt = self.template.format(
+            user_input=query,
+            insights="\n".join(kept[position] for position in sorted(kept)),
+            filters=filters_text
+        )
+        report = PromptReport(
+            tokens=estimate_tokens(prompt),
+            budget=self.budget_tokens,
+            insight_lines=len(lines),
+            insight_lines_kept=len(kept),
+            insight_lines_compacted=compacted,
+            query_truncated=query != user_input.strip(),
+            filters_truncated=filters_text != full_filters
+        )
+        self._record(report)
+        return prompt, report
+
+    def _record(self, report: PromptReport):
+        self.prompts += 1
+        self.total_tokens += report.tokens
+        self.max_tokens = max(self.max_tokens, report.tokens)
+        self.truncated += report.truncated
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "budget_tokens": self.budget_tokens,
+            "prompts": self.prompts,
+            "avg_tokens": round(self.total_tokens / self.prompts, 1) if self.prompts else None,
+            "max_tokens": self.max_tokens,
+            "truncated": self.truncated
+        }
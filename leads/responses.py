@@ -0,0 +1,183 @@
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+# Defaults for the chat response cache
+DEFAULT_RESPONSE_TTL_SECONDS = 600.0
+DEFAULT_RESPONSE_ENTRIES = 1024
+DEFAULT_SIMILARITY_THRESHOLD = 0.75
+
+# Words that carry no meaning for matching questions
+STOPWORDS = frozenset("""
+a an the is are was were be been of in on at for to from by with and or me my i we our us you your
+please can could would will do does did tell show give what which how many much number count total
+there here this that these those all any some list get find about
+""".split())
+
+# Words that change the answer, so similar questions must agree on them exactly
+DISCRIMINATING_WORDS = frozenset("""
+male female boy boys girl girls not no without except hot warm cold top lowest highest least most
+average mean percent percentage before after
+""".split())
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize_query(query: str) -> str:
+    """Lower-case words and digits only, single-spaced"""
+    return " ".join(_WORD.findall(query.lower()))
+
+
+def _stem(word):
+    return word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+
+
+def query_terms(normalized: str) -> Tuple[str, ...]:
+    """Content words of a normalized query, lightly stemmed"""
+    return tuple(_stem(word) for word in normalized.split() if word not in STOPWORDS)
+
+
+def value_terms(values: Iterable[Any]) -> FrozenSet[str]:
+    """Terms of the values in the data (locations, sources, schools, ...), in the form query_terms gives them"""
+    terms = set()
+    for value in values:
+        terms.update(query_terms(normalize_query(str(value))))
+    return frozenset(terms)
+
+
+def _signature(terms, values: FrozenSet[str] = frozenset()):
+    """
+    Terms that must match exactly: anything with a digit (classes, years, codes),
+    discriminating words and every term naming a value in the data
+    """
+    return frozenset(term for term in terms
+                     if any(ch.isdigit() for ch in term) or term in DISCRIMINATING_WORDS or term in values)
+
+
+def _ngrams(terms):
+    return frozenset(terms) | frozenset(zip(terms, terms[1:]))
+
+
+def _similarity(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class ResponseCache:
+    """
+    Bounded, expiring cache of chat answers keyed on (normalized query, filters, data snapshot version).
+
+    Lookups try the exact normalized query first. Failing that, the similarity
+    tier compares word unigrams and bigrams (stopwords dropped, plurals folded)
+    against cached questions for the same filters and data snapshot, and accepts
+    the best match above the threshold when both questions contain exactly the
+    same numbers, discriminating words such as "male"/"female" and data values
+    ("noida" never matches "gurgaon", nor a question without a location). The
+    data values come from put(..., values=...); scopes without them only get
+    exact matches.
+    """
+
+    def __init__(self, ttl=DEFAULT_RESPONSE_TTL_SECONDS, max_entries=DEFAULT_RESPONSE_ENTRIES,
+                 similarity_threshold: Optional[float] = DEFAULT_SIMILARITY_THRESHOLD, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.clock = clock
+        # (filters, version) -> OrderedDict of normalized query -> (value, ngrams, terms, stored_at)
+        self._buckets = {}
+        # (filters, version) -> terms of the values in that data snapshot
+        self._values = {}
+        # LRU order over every entry, as (filters, version, normalized query)
+        self._order = OrderedDict()
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def __len__(self):
+        return len(self._order)
+
+    def clear(self):
+        self._buckets.clear()
+        self._values.clear()
+        self._order.clear()
+
+    def _remove(self, scope, normalized):
+        bucket = self._buckets.get(scope)
+        if bucket is not None:
+            bucket.pop(normalized, None)
+            if not bucket:
+                del self._buckets[scope]
+                self._values.pop(scope, None)
+        self._order.pop((*scope, normalized), None)
+
+    def _touch(self, scope, normalized):
+        self._order.move_to_end((*scope, normalized))
+
+    def get(self, query: str, filters: str, version: str) -> Optional[Any]:
+        """Cached answer for the question, or None; filters is a stable key such as filter_key(params)"""
+        scope = (filters, version)
+        bucket = self._buckets.get(scope)
+        if bucket:
+            now = self.clock()
+            normalized = normalize_query(query)
+            entry = bucket.get(normalized)
+            if entry is not None and now - entry[3] <= self.ttl:
+                self._touch(scope, normalized)
+                self.exact_hits += 1
+                return entry[0]
+
+            values = self._values.get(scope)
+            if self.similarity_threshold is not None and values is not None:
+                terms = query_terms(normalized)
+                ngrams, signature = _ngrams(terms), _signature(terms, values)
+                best, best_score = None, self.similarity_threshold
+                for cached_query, (value, cached_ngrams, cached_terms, stored_at) in list(bucket.items()):
+                    if now - stored_at > self.ttl:
+                        self._remove(scope, cached_query)
+                        continue
+                    if _signature(cached_terms, values) != signature:
+                        continue
+                    score = _similarity(ngrams, cached_ngrams)
+                    if score >= best_score:
+                        best, best_score = cached_query, score
+                if best is not None:
+                    self._touch(scope, best)
+                    self.similar_hits += 1
+                    return bucket[best][0]
+
+        self.misses += 1
+        return None
+
+    def put(self, query: str, filters: str, version: str, value: Any, values: Optional[Iterable[Any]] = None):
+        """
+        Cache an answer; values are the field values of the data it was derived from (see value_terms),
+        which similar questions must mention exactly as this one does
+        """
+        scope = (filters, version)
+        normalized = normalize_query(query)
+        terms = query_terms(normalized)
+        if values is not None and scope not in self._values:
+            self._values[scope] = value_terms(values)
+        self._buckets.setdefault(scope, OrderedDict())[normalized] = \
+            (value, _ngrams(terms), terms, self.clock())
+        self._order[(*scope, normalized)] = None
+        self._touch(scope, normalized)
+        self.stores += 1
+        while len(self._order) > self.max_entries:
+            *oldest_scope, oldest_query = next(iter(self._order))
+            self._remove(tuple(oldest_scope), oldest_query)
+        return value
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.exact_hits + self.similar_hits + self.misses
+        return {
+            "entries": len(self._order),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": round((self.exact_hits + self.similar_hits) / lookups, 3) if lookups else None
+        }
@@ -0,0 +1,251 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .paginate import page_records, page_total
+
+# Lead fields stored as their own indexed columns (see data.json for the full record shape);
+# the whole record is kept as JSON alongside them
+INDEXED_FIELDS = (
+    'schoolCode', 'class', 'gender', 'appliedYear', 'location', 'source', 'status', 'counsellor',
+    'howYouKnowUs', 'acaStart'
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leads (
+    _id TEXT PRIMARY KEY,
+    createdAt TEXT NOT NULL DEFAULT '',
+    isDeleted INTEGER NOT NULL DEFAULT 0,
+    {fields},
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS leads_watermark ON leads (createdAt, _id);
+{indexes}
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+""".format(
+    fields=",\n    ".join(f'"{field}" TEXT COLLATE NOCASE' for field in INDEXED_FIELDS),
+    indexes="\n".join(f'CREATE INDEX IF NOT EXISTS "leads_{field}" ON leads ("{field}");'
+                      for field in ('schoolCode', 'class', 'gender', 'appliedYear', 'status'))
+)
+
+# Filters that are not lead fields
+RESERVED_FILTERS = frozenset({'limit', 'page'})
+
+
+def _text(value):
+    return None if value is None else str(value)
+
+
+def record_watermark(record: Dict[str, Any]) -> Tuple[str, str]:
+    """Sync position of a record: its creation time, then its id to order records created together"""
+    return str(record.get('createdAt') or ''), str(record.get('_id') or '')
+
+
+class LeadStore:
+    """
+    Local SQLite copy of the leads, kept current by incremental syncs.
+
+    Each sync asks the API only for leads created after the stored
+    (createdAt, _id) watermark and upserts them, so after the first full load the
+    upstream API serves a trickle of new records while chat queries run locally.
+    Until that first load is complete the store is not ready and queries go upstream.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        self.last_sync = None
+        self.last_sync_added = 0
+        self.last_error = None
+        self.syncs = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _meta(self, key, default=None):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    @property
+    def ready(self):
+        """True once a full sync has completed, so the store can answer queries on its own"""
+        with self._lock:
+            return self._meta('synced') == '1'
+
+    @property
+    def version(self):
+        """Changes whenever synced records change the stored data"""
+        with self._lock:
+            return self._meta('version', '0')
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+
+    def watermark(self) -> Optional[Tuple[str, str]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT createdAt, _id FROM leads ORDER BY createdAt DESC, _id DESC LIMIT 1").fetchone()
+        return (row[0], row[1]) if row else None
+
+    def upsert(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace records by _id; returns how many were written"""
+        rows = [
+            (str(record['_id']), str(record.get('createdAt') or ''), int(bool(record.get('isDeleted'))),
+             *(_text(record.get(field)) for field in INDEXED_FIELDS), json.dumps(record, default=str))
+            for record in records if record.get('_id') is not None
+        ]
+        if not rows:
+            return 0
+        columns = ", ".join(['_id', 'createdAt', 'isDeleted', *(f'"{field}"' for field in INDEXED_FIELDS), 'record'])
+        placeholders = ", ".join("?" * (len(INDEXED_FIELDS) + 4))
+        with self._lock, self._conn:
+            self._conn.executemany(f"INSERT OR REPLACE INTO leads ({columns}) VALUES ({placeholders})", rows)
+            self._set_meta('version', int(self._meta('version', '0')) + 1)
+        return len(rows)
+
+    def mark_synced(self, synced=True):
+        """Set whether the store holds every lead; either way the next backfill starts from the first page"""
+        with self._lock, self._conn:
+            self._set_meta('synced', int(synced))
+            self._set_meta('backfill_pages', 0)
+            self._set_meta('backfill_per_page', 0)
+
+    def backfill_pages(self) -> Tuple[int, Optional[int]]:
+        """
+        Pages of the full listing stored by backfills that have not yet reached its end,
+        and the records a page the API served them (None before the first such backfill)
+        """
+        with self._lock:
+            return int(self._meta('backfill_pages', '0')), int(self._meta('backfill_per_page', '0')) or None
+
+    def set_backfill_pages(self, pages: int, per_page: int):
+        with self._lock, self._conn:
+            self._set_meta('backfill_pages', pages)
+            self._set_meta('backfill_per_page', per_page)
+
+    def query(self, filters: Dict[str, Any] = None, limit: Optional[int] = None,
+              include_deleted=False) -> List[Dict[str, Any]]:
+        """
+        Stored records whose fields equal the filter values (case-insensitively for indexed
+        fields), newest first when limited
+        """
+        clauses, values = [], []
+        if not include_deleted:
+            clauses.append("isDeleted = 0")
+        for key, value in (filters or {}).items():
+            if key in RESERVED_FILTERS or value is None or value == "":
+                continue
+            if key in INDEXED_FIELDS or key == '_id':
+                clauses.append(f'"{key}" = ?')
+            else:
+                clauses.append("CAST(json_extract(record, ?) AS TEXT) = ?")
+                values.append(f'$."{key}"')
+            values.append(str(value))
+
+        sql = "SELECT record FROM leads"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if limit is not None:
+            sql += " ORDER BY createdAt DESC, _id DESC LIMIT ?"
+            values.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(sql, values).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    async def sync(self, paginator, since_param: str = 'createdAfter') -> int:
+        """
+        Bring the store up to date through paginator; returns how many leads it gained.
+
+        Before the store is ready each sync backfills the full listing instead (see backfill).
+        """
+        try:
+            if self.ready:
+                added = await self._sync_new(paginator, since_param)
+            else:
+                added = await self.backfill(paginator)
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            raise
+        self.last_error = None
+        self.last_sync = time.time()
+        self.last_sync_added = added
+        self.syncs += 1
+        return added
+
+    async def _sync_new(self, paginator, since_param):
+        """
+        Store leads newer than the watermark, sent as since_param.
+
+        Records at or below the watermark are dropped here as well, so an API that
+        ignores the parameter costs bandwidth but never duplicates data. If the page
+        cap cut the walk short, the leads it skipped would fall behind the watermark
+        for good, so the store is marked not ready and backfilled again.
+        """
+        watermark = await asyncio.to_thread(self.watermark)
+        params = {since_param: watermark[0]} if watermark else {}
+        added = 0
+        async for page in paginator.pages(params):
+            new = [record for record in page
+                   if isinstance(record, dict) and (watermark is None or record_watermark(record) > watermark)]
+            if new:
+                added += await asyncio.to_thread(self.upsert, new)
+        if paginator.truncated:
+            await asyncio.to_thread(self.mark_synced, False)
+        return added
+
+    async def backfill(self, paginator) -> int:
+        """
+        Store every page of the unfiltered listing, resuming after the pages earlier backfills stored.
+
+        A walk stopped by the paginator's page cap records how far it got so the next
+        sync carries on from there. Once a walk reaches the end, the store is ready
+        only if it holds as many leads as the API reports; otherwise the listing
+        shifted under the walk and the next backfill starts over from the first page.
+        """
+        skip_pages, per_page = await asyncio.to_thread(self.backfill_pages)
+        before = await asyncio.to_thread(self.count)
+        total = None
+        pages = 0
+        async for response in paginator.responses({}, skip_pages=skip_pages, per_page=per_page):
+            payload = response.json()
+            if total is None:
+                total = page_total(payload)
+            records = [record for record in page_records(payload) if isinstance(record, dict)]
+            if records:
+                await asyncio.to_thread(self.upsert, records)
+            pages += 1
+
+        stored = await asyncio.to_thread(self.count)
+        if paginator.truncated:
+            await asyncio.to_thread(self.set_backfill_pages, skip_pages + pages, paginator.per_page)
+        else:
+            await asyncio.to_thread(self.mark_synced, total is None or stored >= total)
+        return stored - before
+
+    def metrics(self) -> Dict[str, Any]:
+        watermark = self.watermark()
+        return {
+            "path": self.path,
+            "ready": self.ready,
+            "records": self.count(),
+            "backfill_pages": self.backfill_pages()[0],
+            "version": self.version,
+            "watermark": watermark[0] if watermark else None,
+            "syncs": self.syncs,
+            "last_sync": self.last_sync,
+            "last_sync_added": self.last_sync_added,
+            "last_error": self.last_error
+        }
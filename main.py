@@ -1,21 +1,56 @@
 from fastapi import FastAPI, Request, Form, HTTPException
+from fastapi.responses import StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from langchain_google_genai import ChatGoogleGenerativeAI
 from dotenv import load_dotenv
+from pydantic import BaseModel, Field
 import os
 import httpx
 import json
-from typing import Optional, Dict, Any
+import tempfile
+import hashlib
+from typing import Optional, Dict, Any, List, Tuple
 import asyncio
+from contextlib import asynccontextmanager, closing, suppress
 from urllib.parse import urlencode
 
+import numpy as np
+import pandas as pd
+
+from scoring import FEATURE_COLUMNS, MissingColumnsError, ScoringModel, get_model
+from scoring.dtypes import FEATURE_MAX, FEATURE_MIN
+from scoring.io import iter_table_chunks, read_column_names
+from leads import (
+    AsyncTTLCache, LeadAggregates, LeadPaginator, LeadStore, PooledClient, ResponseCache, UpstreamError,
+    filter_key, page_records
+)
+from leads.planner import VALUE_FIELDS, execute_plan, known_values, mentioned_genders, plan_query
+from leads.prompt import PromptBuilder, PromptReport
+
 # Load environment variables from .env file
 load_dotenv()
 
+# Shared connection pool to the external API, configured by ENTAB_HTTP_* variables
+http_client = PooledClient()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    http_client.start()
+    sync_task = asyncio.create_task(sync_lead_store()) if lead_store is not None else None
+    yield
+    if sync_task is not None:
+        sync_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await sync_task
+    await http_client.close()
+
+
 # Initialize FastAPI app
-app = FastAPI(title="Entab Enquiry ChatBOT API", description="A chatbot for querying student application data")
+app = FastAPI(title="Entab Enquiry ChatBOT API", description="A chatbot for querying student application data",
+              lifespan=lifespan)
 
 # Configure CORS for MERN stack integration
 app.add_middleware(
@@ -33,6 +68,30 @@ templates = Jinja2Templates(directory="templates")
 EXTERNAL_API_URL = "https://test-api.entab.info/api/form/leads"
 API_KEY = os.getenv("ENTAB_API_KEY")  # Store your API key in .env file
 
+# Optional local copy of the leads at ENTAB_STORE_PATH, synced in the background every
+# ENTAB_SYNC_INTERVAL seconds; unset, every query goes to the external API
+STORE_PATH = os.getenv("ENTAB_STORE_PATH", "")
+SYNC_INTERVAL_SECONDS = float(os.getenv("ENTAB_SYNC_INTERVAL", 300))
+SYNC_SINCE_PARAM = os.getenv("ENTAB_SYNC_SINCE_PARAM", "createdAfter")
+lead_store = LeadStore(STORE_PATH) if STORE_PATH else None
+
+# Upstream responses are reused per filter set: fresh for ENTAB_CACHE_TTL seconds, then served
+# stale for up to ENTAB_CACHE_STALE more seconds while being refreshed in the background
+student_data_cache = AsyncTTLCache(
+    ttl=float(os.getenv("ENTAB_CACHE_TTL", 60)),
+    stale_ttl=float(os.getenv("ENTAB_CACHE_STALE", 300)),
+    max_entries=int(os.getenv("ENTAB_CACHE_ENTRIES", 256))
+)
+
+# Chat answers are reused for the same (or a closely similar) question on the same filters and data
+response_cache = ResponseCache(
+    ttl=float(os.getenv("CHAT_CACHE_TTL", 600)),
+    max_entries=int(os.getenv("CHAT_CACHE_ENTRIES", 1024))
+)
+
+# Chat prompts are kept within this many estimated tokens, however large the insights grow
+prompt_builder = PromptBuilder(budget_tokens=int(os.getenv("PROMPT_TOKEN_BUDGET", 800)))
+
 # Configure Gemini model via LangChain
 try:
     model = ChatGoogleGenerativeAI(
@@ -45,49 +104,277 @@ except Exception as e:
     model = None
 
 
-# Function to fetch data from external API
-async def fetch_student_data(filters: Dict[str, Any] = None) -> Dict[str, Any]:
+# Concurrent Gemini calls per worker, and the longest a chat waits for one (queueing included)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT", 20))
+llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+
+async def invoke_model(prompt: str) -> str:
     """
-    Fetch student data from the external API with optional filters
+    Run the Gemini call on the event loop without blocking it; raises asyncio.TimeoutError when it takes too long
     """
+    async def call():
+        async with llm_semaphore:
+            ai_response = await model.ainvoke(prompt)
+        return message_text(ai_response.content)
+
+    return await asyncio.wait_for(call(), timeout=LLM_TIMEOUT_SECONDS)
+
+
+def message_text(content) -> str:
+    """Text of a model message or chunk, whose content may be a string or a list of parts"""
+    if isinstance(content, str):
+        return content
+    return "".join(part if isinstance(part, str) else part.get("text", "") for part in content)
+
+
+async def stream_model(prompt: str):
+    """
+    Yield the Gemini answer as it is generated; raises asyncio.TimeoutError when any chunk takes too long
+    """
+    async with llm_semaphore:
+        chunks = model.astream(prompt).__aiter__()
+        while True:
+            try:
+                chunk = await asyncio.wait_for(chunks.__anext__(), timeout=LLM_TIMEOUT_SECONDS)
+            except StopAsyncIteration:
+                return
+            text = message_text(chunk.content)
+            if text:
+                yield text
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+# Rows scored per vectorized step by /score/batch
+SCORE_BATCH_ROWS = 10_000
+
+# Request bodies for CSV batch scoring stay in memory up to this size, then spill to disk
+SCORE_SPOOL_BYTES = 16 * 1024 * 1024
+
+# Size of the blocks spooled batch results are streamed back in
+SCORE_STREAM_BLOCK_BYTES = 256 * 1024
+
+
+class LeadScores(BaseModel):
+    """The eight feature scores of a single lead, each between FEATURE_MIN and FEATURE_MAX (0 and 100)"""
+    location_score: float = Field(..., ge=FEATURE_MIN, le=FEATURE_MAX)
+    how_you_know_us_score: float = Field(..., ge=FEATURE_MIN, le=FEATURE_MAX)
+    sibling_in_school_score: float = Field(..., ge=FEATURE_MIN, le=FEATURE_MAX)
+    previous_school_name_score: float = Field(..., ge=FEATURE_MIN, le=FEATURE_MAX)
+    class_applied_for_score: float = Field(..., ge=FEATURE_MIN, le=FEATURE_MAX)
+    last_class_percentage_score: float = Field(..., ge=FEATURE_MIN, le=FEATURE_MAX)
+    communication_email_different_score: float = Field(..., ge=FEATURE_MIN, le=FEATURE_MAX)
+    whatsapp_number_different_score: float = Field(..., ge=FEATURE_MIN, le=FEATURE_MAX)
+
+
+class BatchRowError(ValueError):
+    """A row of a batch that cannot be scored; the message names the row (counting from 1)"""
+
+
+def resolve_scoring_model(name: str) -> ScoringModel:
     try:
-        # Prepare query parameters
-        params = {}
-        if filters:
-            for key, value in filters.items():
-                if value is not None and value != "":
-                    params[key] = value
-
-        # Set default limit if not specified
-        if 'limit' not in params:
-            params['limit'] = 50
+        return get_model(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        # Add API key if available
-        headers = {}
-        if API_KEY:
-            headers['Authorization'] = f'Bearer {API_KEY}'
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                EXTERNAL_API_URL,
-                params=params,
-                headers=headers
-            )
-
-            if response.status_code == 200:
-                return response.json()
+
+def validate_features(df: pd.DataFrame, first_row: int = 0):
+    """
+    Convert the feature columns to numbers in place, rejecting the values /score rejects:
+    missing, non-numeric or outside FEATURE_MIN to FEATURE_MAX
+    """
+    missing = [col for col in FEATURE_COLUMNS if col not in df.columns]
+    if missing:
+        raise MissingColumnsError(missing)
+
+    for col in FEATURE_COLUMNS:
+        values = pd.to_numeric(df[col], errors='coerce')
+        invalid = (values.isna() | (values < FEATURE_MIN) | (values > FEATURE_MAX)).to_numpy()
+        if invalid.any():
+            position = int(invalid.argmax())
+            raw = df[col].iloc[position]
+            raw = raw.item() if isinstance(raw, np.generic) else raw
+            if raw is None or (isinstance(raw, float) and raw != raw):
+                problem = "is missing"
+            elif pd.isna(values.iloc[position]):
+                problem = f"is not a number ({raw!r})"
             else:
-                return {
-                    "error": f"API request failed with status {response.status_code}",
-                    "message": response.text
-                }
+                problem = f"must be between {FEATURE_MIN} and {FEATURE_MAX} (got {raw!r})"
+            raise BatchRowError(f"Row {first_row + position + 1}: {col} {problem}")
+        df[col] = values
+
+
+def score_frame(df: pd.DataFrame, scoring_model: ScoringModel, first_row: int = 0) -> pd.DataFrame:
+    """Validate and score a batch of leads in place; first_row is the batch's offset, for error messages"""
+    validate_features(df, first_row)
+    df['lead_score'] = scoring_model.score(df)
+    df['lead_category'] = scoring_model.categorize(df['lead_score'])
+    return df
+
+
+def score_records(records: List[Any], scoring_model: ScoringModel, first_row: int = 0) -> pd.DataFrame:
+    """
+    Score a batch of lead records in one vectorized pass; every other field is passed through
+    """
+    for i, record in enumerate(records):
+        if not isinstance(record, dict):
+            raise BatchRowError(f"Row {first_row + i + 1}: expected a lead object, got {type(record).__name__}")
+    return score_frame(pd.DataFrame.from_records(records), scoring_model, first_row)
+
+
+def records_to_ndjson(df: pd.DataFrame) -> str:
+    text = df.to_json(orient='records', lines=True, double_precision=15)
+    return text if text.endswith('\n') else text + '\n'
+
+
+async def iter_ndjson_batches(request: Request, batch_rows: int = SCORE_BATCH_ROWS):
+    """
+    Parse an NDJSON request body as it arrives, yielding lists of at most batch_rows records
+    """
+    buffer = b""
+    batch = []
+    async for piece in request.stream():
+        buffer += piece
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                batch.append(json.loads(line))
+                if len(batch) >= batch_rows:
+                    yield batch
+                    batch = []
+    if buffer.strip():
+        batch.append(json.loads(buffer))
+    if batch:
+        yield batch
+
+
+# Function to turn user filters into the query parameters sent upstream
+def normalize_filters(filters: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Drop empty filter values; without a limit every matching lead is fetched, page by page
+    """
+    params = {}
+    if filters:
+        for key, value in filters.items():
+            if value is not None and value != "":
+                params[key] = value
+
+    return params
+
+
+# Function to build the headers sent to the external API
+def api_headers() -> Dict[str, str]:
+    headers = {}
+    if API_KEY:
+        headers['Authorization'] = f'Bearer {API_KEY}'
+    return headers
+
+
+# Background task keeping the local lead store current
+async def sync_lead_store():
+    while True:
+        try:
+            await lead_store.sync(lead_paginator(api_headers()), since_param=SYNC_SINCE_PARAM)
+        except Exception as e:
+            print(f"Warning: Lead store sync failed: {str(e)}")
+        await asyncio.sleep(SYNC_INTERVAL_SECONDS)
+
+
+# Function to answer a data request from the local lead store
+def query_lead_store(params: Dict[str, Any]) -> Dict[str, Any]:
+    records = lead_store.query(params, limit=params.get('limit'))
+    return {
+        "data": records,
+        "total": len(records),
+        "_snapshot": f"store-{lead_store.version}"
+    }
+
+
+# Function to build the paginator that walks every page of a query
+def lead_paginator(headers: Dict[str, str]) -> LeadPaginator:
+    return LeadPaginator(
+        http_client,
+        EXTERNAL_API_URL,
+        headers=headers,
+        page_size=int(os.getenv("ENTAB_PAGE_SIZE", 100)),
+        concurrency=int(os.getenv("ENTAB_PAGE_CONCURRENCY", 6)),
+        max_retries=int(os.getenv("ENTAB_PAGE_RETRIES", 3)),
+        max_pages=int(os.getenv("ENTAB_MAX_PAGES", 200)),
+        page_param=os.getenv("ENTAB_PAGE_PARAM", "page")
+    )
+
+
+# Function to request data from external API
+async def request_student_data(params: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Request student data from the external API, bypassing the cache; all pages unless params sets a limit
+    """
+    try:
+        # Add API key if available
+        headers = api_headers()
 
-    except httpx.TimeoutException:
+        if 'limit' not in params:
+            try:
+                return await asyncio.wait_for(lead_paginator(headers).collect(params), timeout=timeout)
+            except UpstreamError as e:
+                return {"error": str(e), "message": e.body}
+
+        response = await http_client.get(
+            EXTERNAL_API_URL,
+            params=params,
+            headers=headers,
+            timeout=timeout
+        )
+
+        if response.status_code == 200:
+            data = response.json()
+            if isinstance(data, dict):
+                # Identifies this exact upstream payload, for caching answers derived from it
+                data["_snapshot"] = hashlib.blake2b(response.content, digest_size=8).hexdigest()
+            return data
+        else:
+            return {
+                "error": f"API request failed with status {response.status_code}",
+                "message": response.text
+            }
+
+    except (httpx.TimeoutException, asyncio.TimeoutError):
         return {"error": "API request timed out"}
     except Exception as e:
         return {"error": f"Failed to fetch data: {str(e)}"}
 
 
+# Function to fetch data from external API
+async def fetch_student_data(filters: Dict[str, Any] = None, timeout: Optional[float] = None,
+                             use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Fetch student data with optional filters, from the local store once it is synced; otherwise
+    identical filter sets share cached and in-flight responses. use_cache=False always asks the API.
+    """
+    params = normalize_filters(filters)
+    if use_cache and lead_store is not None and lead_store.ready:
+        return await asyncio.to_thread(query_lead_store, params)
+    if not use_cache:
+        return await request_student_data(params, timeout)
+    return await student_data_cache.get_or_fetch(filter_key(params),
+                                                 lambda: request_student_data(params, timeout))
+
+
+# Dimensions summarized by generate_data_insights (top 3 values each), besides gender
+INSIGHT_DIMENSIONS = [
+    ('schoolCode', 'Top schools'),
+    ('location', 'Top locations'),
+    ('source', 'Top sources'),
+    ('howYouKnowUs', 'Top referral channels'),
+    ('status', 'Top statuses'),
+    ('counsellor', 'Top counsellors'),
+]
+
+
 # Function to analyze data and generate insights
 def generate_data_insights(data: Dict[str, Any], user_query: str) -> str:
     """
@@ -98,70 +385,48 @@ def generate_data_insights(data: Dict[str, Any], user_query: str) -> str:
 
     # Extract relevant information from the data
     try:
-        # Assuming the API returns data in a specific format
-        # Adjust this based on the actual API response structure
-        students = data.get('data', []) if isinstance(data.get('data'), list) else []
+        # The API returns records under 'data' (or 'leads' for unpaged responses)
+        students = page_records(data)
         total_count = data.get('total', len(students))
 
+        # Count every dimension in one pass over the records
+        aggregates = LeadAggregates.from_records(
+            students, dimensions=['gender'] + [dimension for dimension, _ in INSIGHT_DIMENSIONS])
+        gender_counts = aggregates.counts['gender']
+
         # Generate basic statistics
         insights = []
-        insights.append(f"Found {total_count} student records.")
+        fetched = data.get('fetched', len(students))
+        if data.get('truncated') and fetched >= total_count:
+            # Stopped at the page cap without an upstream total: more records may match than were fetched
+            insights.append(f"Found at least {fetched} student records.")
+            insights.append(f"Note: only the first {fetched} records could be fetched, "
+                            f"so the figures below cover those records only.")
+        else:
+            insights.append(f"Found {total_count} student records.")
+            if data.get('truncated'):
+                insights.append(f"Note: only {fetched} of {total_count} records could be fetched, "
+                                f"so the figures below cover those records only.")
 
         if students:
-            # Gender distribution
-            gender_counts = {}
-            school_counts = {}
-            class_counts = {}
-            location_counts = {}
-            year_counts = {}
-
-            for student in students:
-                # Gender analysis
-                gender = student.get('gender', 'Unknown')
-                gender_counts[gender] = gender_counts.get(gender, 0) + 1
-
-                # School analysis
-                school = student.get('schoolCode', 'Unknown')
-                school_counts[school] = school_counts.get(school, 0) + 1
-
-                # Class analysis
-                class_name = student.get('class', 'Unknown')
-                class_counts[class_name] = class_counts.get(class_name, 0) + 1
-
-                # Location analysis
-                location = student.get('location', 'Unknown')
-                location_counts[location] = location_counts.get(location, 0) + 1
-
-                # Year analysis
-                year = student.get('appliedYear', 'Unknown')
-                year_counts[year] = year_counts.get(year, 0) + 1
-
             # Add gender insights
             if len(gender_counts) > 1:
                 gender_info = ", ".join([f"{k}: {v}" for k, v in gender_counts.items()])
                 insights.append(f"Gender distribution: {gender_info}")
 
-            # Add school insights
-            if len(school_counts) > 1:
-                top_schools = sorted(school_counts.items(), key=lambda x: x[1], reverse=True)[:3]
-                school_info = ", ".join([f"{k}: {v}" for k, v in top_schools])
-                insights.append(f"Top schools: {school_info}")
-
-            # Add location insights
-            if len(location_counts) > 1:
-                top_locations = sorted(location_counts.items(), key=lambda x: x[1], reverse=True)[:3]
-                location_info = ", ".join([f"{k}: {v}" for k, v in top_locations])
-                insights.append(f"Top locations: {location_info}")
+            # Add top values of the other dimensions
+            for dimension, label in INSIGHT_DIMENSIONS:
+                if aggregates.distinct(dimension) > 1:
+                    top_values = aggregates.top(dimension, 3)
+                    insights.append(f"{label}: " + ", ".join([f"{k}: {v}" for k, v in top_values]))
 
         # Combine insights
         result = "\n".join(insights)
 
-        # Add context-specific response based on user query
-        query_lower = user_query.lower()
-        if "male" in query_lower or "female" in query_lower:
-            gender_filter = "male" if "male" in query_lower else "female"
-            gender_count = gender_counts.get(gender_filter.title(), 0)
-            result += f"\n\nSpecifically for {gender_filter} students: {gender_count} records found."
+        # Add context-specific response based on user query (whole words, so "female" is not also "male")
+        for gender in mentioned_genders(user_query):
+            gender_count = gender_counts.get(gender, 0)
+            result += f"\n\nSpecifically for {gender.lower()} students: {gender_count} records found."
 
         return result
 
@@ -169,12 +434,65 @@ def generate_data_insights(data: Dict[str, Any], user_query: str) -> str:
         return f"Error analyzing data: {str(e)}"
 
 
+# Function to answer count and breakdown questions straight from the data
+def answer_directly(data: Dict[str, Any], user_query: str) -> Optional[str]:
+    """
+    Answer questions the query planner understands without the AI; None for everything else
+    """
+    if "error" in data or data.get('truncated'):
+        # Exact counts need every matching record
+        return None
+    students = page_records(data)
+    plan = plan_query(user_query, known_values(students))
+    if plan is None:
+        return None
+    return execute_plan(plan, students, total=data.get('total'))
+
+
 # Root endpoint for serving the HTML interface
 @app.get("/")
 async def root(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
+# Function to parse the filters form field
+def parse_filters(filters: str) -> Dict[str, Any]:
+    try:
+        return json.loads(filters) if filters else {}
+    except json.JSONDecodeError:
+        return {}
+
+
+# Function to build the prompt sent to the AI
+def build_chat_prompt(user_input: str, data_insights: str, filter_dict: Dict[str, Any]) -> Tuple[str, PromptReport]:
+    """
+    Prompt for the AI within the PROMPT_TOKEN_BUDGET, keeping the insight lines most relevant to the query
+    """
+    return prompt_builder.build(user_input, data_insights, filter_dict)
+
+
+# Fields whose values a cached answer's question must mention exactly as a new one does ("noida" vs "gurgaon")
+RESPONSE_CACHE_VALUE_FIELDS = tuple(dict.fromkeys(
+    ('gender', 'appliedYear', *VALUE_FIELDS, *(dimension for dimension, _ in INSIGHT_DIMENSIONS))))
+
+
+# Function to list the data values that tell cached questions apart
+def response_cache_values(student_data: Dict[str, Any]) -> List[str]:
+    values = known_values(page_records(student_data), fields=RESPONSE_CACHE_VALUE_FIELDS)
+    return [value for field_values in values.values() for value in field_values]
+
+
+# Function to scope cached chat answers to a filter set and data snapshot
+def response_cache_scope(filter_dict: Dict[str, Any], student_data: Dict[str, Any]) -> Optional[tuple]:
+    """
+    (filters key, snapshot version) for the response cache, or None when the data is not cacheable (errors)
+    """
+    version = student_data.get("_snapshot") if isinstance(student_data, dict) else None
+    if version is None:
+        return None
+    return filter_key(normalize_filters(filter_dict)), version
+
+
 # Chat endpoint that integrates external API with AI
 @app.post("/chat")
 async def chat(
@@ -186,59 +504,246 @@ async def chat(
             raise HTTPException(status_code=400, detail="Input cannot be empty")
 
         # Parse filters
-        try:
-            filter_dict = json.loads(filters) if filters else {}
-        except json.JSONDecodeError:
-            filter_dict = {}
+        filter_dict = parse_filters(filters)
 
         # Fetch data from external API
         student_data = await fetch_student_data(filter_dict)
 
+        # Answer repeated questions from the response cache
+        scope = response_cache_scope(filter_dict, student_data)
+        cached = response_cache.get(user_input, *scope) if scope else None
+        if cached is not None:
+            return {"response": cached["response"]}
+
+        # Count and breakdown questions are answered from the data without the AI
+        direct_answer = answer_directly(student_data, user_input)
+        if direct_answer is not None:
+            return {"response": direct_answer}
+
         # Generate insights about the data
         data_insights = generate_data_insights(student_data, user_input)
+        cacheable = scope is not None
+
+        prompt_report = None
 
         # If Gemini model is available, enhance the response
         if model:
             try:
                 # Create a context-aware prompt for the AI
-                context_prompt = f"""
-                You are a helpful assistant analyzing student application data. 
-
-                User Query: {user_input}
-
-                Current Data Insights: {data_insights}
-
-                Applied Filters: {json.dumps(filter_dict, indent=2) if filter_dict else "None"}
-
-                Please provide a helpful, conversational response about the student data. 
-                Keep it concise and relevant to the user's question. If they're asking for 
-                specific information that's not in the insights, acknowledge what data is 
-                available and suggest how they might refine their query or filters.
-                """
+                context_prompt, prompt_report = build_chat_prompt(user_input, data_insights, filter_dict)
 
-                ai_response = model.invoke(context_prompt)
-                response_text = ai_response.content
+                response_text = await invoke_model(context_prompt)
 
+            except asyncio.TimeoutError:
+                # Answer from the data insights rather than keep the user waiting
+                response_text = f"{data_insights}\n\n(Note: AI response timed out after {LLM_TIMEOUT_SECONDS:g}s)"
+                cacheable = False
             except Exception as e:
                 # Fallback to data insights if AI fails
                 response_text = f"{data_insights}\n\n(Note: AI enhancement unavailable: {str(e)})"
+                cacheable = False
         else:
             # Use just the data insights if no AI model
             response_text = data_insights
 
+        if cacheable:
+            response_cache.put(user_input, *scope, {"insights": data_insights, "response": response_text},
+                               values=response_cache_values(student_data))
+
+        if prompt_report is not None:
+            return {"response": response_text, "prompt": prompt_report.to_dict()}
         return {"response": response_text}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing request: {str(e)}")
 
 
+# Streaming chat endpoint: the data insights first, then the AI answer token by token, as Server-Sent Events
+@app.post("/chat/stream")
+async def chat_stream(
+        user_input: str = Form(...),
+        filters: str = Form(default="{}")
+):
+    if not user_input.strip():
+        raise HTTPException(status_code=400, detail="Input cannot be empty")
+
+    filter_dict = parse_filters(filters)
+
+    async def events():
+        try:
+            student_data = await fetch_student_data(filter_dict)
+
+            scope = response_cache_scope(filter_dict, student_data)
+            cached = response_cache.get(user_input, *scope) if scope else None
+            if cached is not None:
+                yield sse_event("insights", {"text": cached["insights"]})
+                if cached["response"] != cached["insights"]:
+                    yield sse_event("token", {"text": cached["response"]})
+                yield sse_event("done", {})
+                return
+
+            direct_answer = answer_directly(student_data, user_input)
+            if direct_answer is not None:
+                yield sse_event("insights", {"text": direct_answer})
+                yield sse_event("done", {})
+                return
+
+            data_insights = generate_data_insights(student_data, user_input)
+            yield sse_event("insights", {"text": data_insights})
+
+            response_text = data_insights
+            if model:
+                try:
+                    context_prompt, prompt_report = build_chat_prompt(user_input, data_insights, filter_dict)
+                    yield sse_event("prompt", prompt_report.to_dict())
+                    tokens = []
+                    async for token in stream_model(context_prompt):
+                        tokens.append(token)
+                        yield sse_event("token", {"text": token})
+                    response_text = "".join(tokens)
+                except asyncio.TimeoutError:
+                    scope = None
+                    yield sse_event("notice", {"text": f"AI response timed out after {LLM_TIMEOUT_SECONDS:g}s"})
+                except Exception as e:
+                    scope = None
+                    yield sse_event("notice", {"text": f"AI enhancement unavailable: {str(e)}"})
+
+            if scope is not None:
+                response_cache.put(user_input, *scope, {"insights": data_insights, "response": response_text},
+                                   values=response_cache_values(student_data))
+        except Exception as e:
+            yield sse_event("error", {"text": f"Error processing request: {str(e)}"})
+        yield sse_event("done", {})
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+# Score a single lead
+@app.post("/score")
+async def score_lead(lead: LeadScores, model_name: str = "standard"):
+    scoring_model = resolve_scoring_model(model_name)
+    lead_score = scoring_model.score_one(*(getattr(lead, col) for col in FEATURE_COLUMNS))
+    lead_category = scoring_model.categorize_one(lead_score)
+    return {
+        "lead_score": lead_score,
+        "lead_category": lead_category,
+        "color": scoring_model.color(lead_category),
+        "model": scoring_model.name
+    }
+
+
+# Score many leads: a JSON array, an NDJSON stream or a CSV body, answered in the same format
+@app.post("/score/batch")
+async def score_lead_batch(request: Request, model_name: str = "standard"):
+    scoring_model = resolve_scoring_model(model_name)
+    content_type = request.headers.get("content-type", "application/json").split(";")[0].strip().lower()
+
+    if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        # Score each batch as the body arrives; results are spooled because the response
+        # can only start once the request body has been read
+        results = tempfile.SpooledTemporaryFile(max_size=SCORE_SPOOL_BYTES, mode='w+b')
+        rows = 0
+        try:
+            async for batch in iter_ndjson_batches(request):
+                results.write(records_to_ndjson(score_records(batch, scoring_model, first_row=rows)).encode())
+                rows += len(batch)
+        except (ValueError, MissingColumnsError) as e:
+            results.close()
+            raise HTTPException(status_code=422, detail=f"Failed to score batch: {str(e)}")
+        results.seek(0)
+
+        def ndjson_results():
+            with results:
+                yield from iter(lambda: results.read(SCORE_STREAM_BLOCK_BYTES), b"")
+
+        return StreamingResponse(ndjson_results(), media_type="application/x-ndjson")
+
+    if content_type == "text/csv":
+        # Spool the upload so it can be re-read in chunks without holding it all in memory
+        body = tempfile.SpooledTemporaryFile(max_size=SCORE_SPOOL_BYTES, mode='w+b')
+        async for piece in request.stream():
+            body.write(piece)
+
+        try:
+            missing = [col for col in FEATURE_COLUMNS if col not in read_column_names(body, 'csv')]
+        except Exception as e:
+            body.close()
+            raise HTTPException(status_code=400, detail=f"Could not parse CSV body: {str(e)}")
+        if missing:
+            body.close()
+            raise HTTPException(status_code=422, detail=str(MissingColumnsError(missing)))
+
+        # The first chunk is checked before the response starts, so a bad upload gets a proper error status
+        chunks = iter_table_chunks(body, fmt='csv', chunksize=SCORE_BATCH_ROWS)
+        try:
+            first = next(chunks, None)
+            if first is not None:
+                score_frame(first, scoring_model)
+        except (BatchRowError, MissingColumnsError) as e:
+            chunks.close()
+            body.close()
+            raise HTTPException(status_code=422, detail=f"Failed to score batch: {str(e)}")
+        except Exception as e:
+            chunks.close()
+            body.close()
+            raise HTTPException(status_code=400, detail=f"Could not parse CSV body: {str(e)}")
+
+        def csv_results():
+            with body, closing(chunks):
+                if first is None:
+                    return
+                yield first.to_csv(index=False)
+                rows = len(first)
+                try:
+                    for chunk in chunks:
+                        yield score_frame(chunk, scoring_model, first_row=rows).to_csv(header=False, index=False)
+                        rows += len(chunk)
+                except Exception as e:
+                    # Too late for an error status: end with an error line and abort the response,
+                    # so the body is never mistaken for a complete result
+                    yield f"# error: Failed to score batch: {str(e)}\n"
+                    raise
+
+        return StreamingResponse(csv_results(), media_type="text/csv")
+
+    # Plain JSON: an array of lead objects
+    try:
+        records = json.loads(await request.body())
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON body: {str(e)}")
+    if not isinstance(records, list):
+        raise HTTPException(status_code=400, detail="Expected a JSON array of leads")
+
+    try:
+        scored = [score_records(records[start:start + SCORE_BATCH_ROWS], scoring_model, first_row=start)
+                  for start in range(0, len(records), SCORE_BATCH_ROWS)]
+    except (ValueError, MissingColumnsError) as e:
+        raise HTTPException(status_code=422, detail=f"Failed to score batch: {str(e)}")
+
+    def json_results():
+        yield "["
+        for i, df in enumerate(scored):
+            text = df.to_json(orient='records', double_precision=15)
+            if len(text) > 2:
+                yield ("," if i else "") + text[1:-1]
+        yield "]"
+
+    return StreamingResponse(json_results(), media_type="application/json")
+
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
     return {
         "status": "healthy",
         "external_api": EXTERNAL_API_URL,
-        "ai_model": "available" if model else "unavailable"
+        "ai_model": "available" if model else "unavailable",
+        "upstream_pool": http_client.metrics(),
+        "upstream_cache": student_data_cache.metrics(),
+        "response_cache": response_cache.metrics(),
+        "prompts": prompt_builder.metrics(),
+        "lead_store": lead_store.metrics() if lead_store is not None else None
     }
 
 
@@ -246,7 +751,7 @@ async def health_check():
 @app.get("/test-api")
 async def test_external_api():
     try:
-        test_data = await fetch_student_data({"limit": 5})
+        test_data = await fetch_student_data({"limit": 5}, use_cache=False)
         return {
             "status": "success",
             "sample_data": test_data
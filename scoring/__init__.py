@@ -0,0 +1,38 @@
+"""Lead scoring library shared by the dashboards, the API and batch jobs.
+
+Importing this package only pulls in NumPy and pandas, never Streamlit or Plotly.
+"""
+
+from scoring.engine import (
+    FEATURE_COLUMNS, WEIGHTS, HOT_THRESHOLD, WARM_THRESHOLD,
+    score_matrix, score_frame, category_codes, categorize_scores, calculate_lead_score
+)
+from scoring.model import (
+    FEATURE_DESCRIPTIONS, ScoringModel, STANDARD_MODEL, ENTAB_MODEL, MODELS, get_model
+)
+from scoring.correlation import CorrelationStats, linear_combination_correlations
+from scoring.stats import LeadStats
+from scoring.index import ScoreIndex
+from scoring.cache import ScoredDataset, ScoredDatasetCache, content_key, scored_datasets
+from scoring.stream import (
+    DEFAULT_CHUNK_ROWS, MissingColumnsError, StreamResult, iter_scored_chunks, score_file_stream
+)
+from scoring.io import detect_format, read_column_names, read_table, iter_table_chunks
+from scoring.dtypes import NormalizationReport, normalize_frame, compact_dtype_map, feature_range_violations
+from scoring.export import EXPORT_FORMATS, export_rows
+from scoring.batch import BatchResult, plan_partitions, score_file_parallel
+from scoring.synthetic import generate_leads, iter_lead_chunks, write_leads
+
+__all__ = [
+    'FEATURE_COLUMNS', 'WEIGHTS', 'HOT_THRESHOLD', 'WARM_THRESHOLD',
+    'score_matrix', 'score_frame', 'category_codes', 'categorize_scores', 'calculate_lead_score',
+    'FEATURE_DESCRIPTIONS', 'ScoringModel', 'STANDARD_MODEL', 'ENTAB_MODEL', 'MODELS', 'get_model',
+    'CorrelationStats', 'linear_combination_correlations', 'LeadStats', 'ScoreIndex',
+    'ScoredDataset', 'ScoredDatasetCache', 'content_key', 'scored_datasets',
+    'DEFAULT_CHUNK_ROWS', 'MissingColumnsError', 'StreamResult', 'iter_scored_chunks', 'score_file_stream',
+    'detect_format', 'read_column_names', 'read_table', 'iter_table_chunks',
+    'NormalizationReport', 'normalize_frame', 'compact_dtype_map', 'feature_range_violations',
+    'EXPORT_FORMATS', 'export_rows',
+    'BatchResult', 'plan_partitions', 'score_file_parallel',
+    'generate_leads', 'iter_lead_chunks', 'write_leads'
+]
@@ -0,0 +1,321 @@
+"""Parallel batch scoring of large lead files across worker processes.
+
+Run nightly over every school's export with, for example:
+
+    python batch_score.py exports/*.parquet --output-dir scored/ --workers 8 --summary summary.json
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from scoring.engine import FEATURE_COLUMNS
+from scoring.io import detect_format, read_column_names
+from scoring.model import MODELS, ScoringModel, STANDARD_MODEL, get_model
+from scoring.stats import LeadStats
+from scoring.stream import MissingColumnsError
+
+# CSV inputs are split into byte ranges of about this size, one per task
+DEFAULT_PARTITION_BYTES = 64 * 1024 * 1024
+
+# Parquet row groups and Arrow record batches are combined into tasks of at least this many rows
+DEFAULT_PARTITION_ROWS = 500_000
+
+# Output formats by file extension
+OUTPUT_FORMATS = {'.csv': 'csv', '.parquet': 'parquet', '.pq': 'parquet'}
+
+
+@dataclass
+class Partition:
+    """One independently scored piece of an input file"""
+
+    index: int
+    path: str
+    fmt: str
+    # CSV: byte range of the data lines; Parquet: row groups; Arrow: record batches
+    start: int = 0
+    stop: int = 0
+    groups: List[int] = field(default_factory=list)
+    header: bytes = b''
+
+
+@dataclass
+class PartitionResult:
+    index: int
+    rows: int
+    stats: LeadStats
+    part_path: Optional[str]
+
+
+@dataclass
+class BatchResult:
+    """Merged outcome of a parallel scoring run"""
+
+    source: str
+    stats: LeadStats
+    partitions: int
+    workers: int
+    seconds: float
+    output: Optional[str] = None
+
+    @property
+    def rows(self):
+        return self.stats.count
+
+    def summary(self):
+        """JSON-serializable summary for reports and nightly logs"""
+        return {
+            "source": self.source,
+            "output": self.output,
+            "rows": self.rows,
+            "partitions": self.partitions,
+            "workers": self.workers,
+            "seconds": round(self.seconds, 3),
+            **stats_summary(self.stats)
+        }
+
+
+def stats_summary(stats: LeadStats):
+    with np.errstate(invalid='ignore'):
+        correlations = stats.feature_correlations()
+    return {
+        "model": stats.model.name,
+        "mean_score": None if stats.scored == 0 else round(stats.mean, 4),
+        "min_score": None if stats.scored == 0 else stats.score_min,
+        "max_score": None if stats.scored == 0 else stats.score_max,
+        "categories": {label: int(count) for label, count in zip(stats.model.labels, stats.category_counts)},
+        "histogram": {
+            "bin_edges": stats.bin_edges.tolist(),
+            "counts": stats.histogram.sum(axis=0).tolist()
+        },
+        "feature_correlations": {col: (None if np.isnan(value) else round(float(value), 6))
+                                 for col, value in zip(FEATURE_COLUMNS, correlations)}
+    }
+
+
+def _csv_partitions(path, partition_bytes):
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        header = f.readline()
+        start = f.tell()
+        boundaries = [start]
+        while boundaries[-1] < size:
+            f.seek(min(boundaries[-1] + partition_bytes, size))
+            # Move to the start of the next line so no row is split between partitions
+            f.readline()
+            boundaries.append(min(f.tell(), size))
+    ranges = [(lo, hi) for lo, hi in zip(boundaries, boundaries[1:]) if hi > lo]
+    return [Partition(index=i, path=path, fmt='csv', start=lo, stop=hi, header=header)
+            for i, (lo, hi) in enumerate(ranges)]
+
+
+def _grouped(sizes, partition_rows):
+    """Consecutive group indices combined until each task has at least partition_rows rows"""
+    groups, current, rows = [], [], 0
+    for i, size in enumerate(sizes):
+        current.append(i)
+        rows += size
+        if rows >= partition_rows:
+            groups.append(current)
+            current, rows = [], 0
+    if current:
+        groups.append(current)
+    return groups
+
+
+def plan_partitions(path, fmt=None, partition_bytes=DEFAULT_PARTITION_BYTES, partition_rows=DEFAULT_PARTITION_ROWS):
+    """
+    Split an input file into partitions that workers can read on their own.
+
+    CSV files are cut into byte ranges at line boundaries (quoted fields with
+    embedded newlines are not supported); Parquet files by row group and Arrow
+    IPC files by record batch, both combined up to partition_rows rows.
+    """
+    fmt = fmt or detect_format(path)
+    if fmt == 'csv':
+        return _csv_partitions(path, partition_bytes)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        metadata = pq.ParquetFile(path).metadata
+        sizes = [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+    else:
+        import pyarrow.ipc as ipc
+        with ipc.open_file(path) as reader:
+            sizes = [reader.get_batch(i).num_rows for i in range(reader.num_record_batches)]
+    return [Partition(index=i, path=path, fmt=fmt, groups=groups)
+            for i, groups in enumerate(_grouped(sizes, partition_rows))]
+
+
+def read_partition(partition: Partition, columns=None) -> pd.DataFrame:
+    if partition.fmt == 'csv':
+        with open(partition.path, 'rb') as f:
+            f.seek(partition.start)
+            body = f.read(partition.stop - partition.start)
+        return pd.read_csv(io.BytesIO(partition.header + body), usecols=columns)
+    if partition.fmt == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(partition.path).read_row_groups(partition.groups, columns=columns).to_pandas()
+
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    with ipc.open_file(partition.path) as reader:
+        table = pa.Table.from_batches([reader.get_batch(i) for i in partition.groups])
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas()
+
+
+def score_partition(partition: Partition, model: ScoringModel = STANDARD_MODEL, columns=None,
+                    part_dir=None, output_fmt='csv') -> PartitionResult:
+    """Score one partition, aggregate it and (when part_dir is given) write its scored rows to a part file"""
+    df = read_partition(partition, columns=columns)
+    scores = model.score(df)
+    df['lead_score'] = scores
+    df['lead_category'] = model.categorize(scores)
+    stats = LeadStats(model).update_frame(df)
+
+    part_path = None
+    if part_dir is not None:
+        part_path = os.path.join(part_dir, f"part-{partition.index:06d}.{output_fmt}")
+        if output_fmt == 'csv':
+            df.to_csv(part_path, header=partition.index == 0, index=False)
+        else:
+            df.to_parquet(part_path, index=False)
+    return PartitionResult(index=partition.index, rows=len(df), stats=stats, part_path=part_path)
+
+
+def _score_partition_task(args):
+    return score_partition(*args)
+
+
+def _merge_parts(results, output, output_fmt):
+    """Concatenate part files in partition order into the final output"""
+    if output_fmt == 'csv':
+        with open(output, 'wb') as out:
+            for result in results:
+                with open(result.part_path, 'rb') as part:
+                    shutil.copyfileobj(part, out)
+        return
+
+    import pyarrow.parquet as pq
+    writer = None
+    try:
+        for result in results:
+            table = pq.read_table(result.part_path)
+            if writer is None:
+                writer = pq.ParquetWriter(output, table.schema)
+            elif table.schema != writer.schema:
+                # e.g. an integer column that has missing values only in some partitions
+                table = table.cast(writer.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def score_file_parallel(path, output=None, model: ScoringModel = STANDARD_MODEL, workers=None, fmt=None,
+                        columns=None, partition_bytes=DEFAULT_PARTITION_BYTES,
+                        partition_rows=DEFAULT_PARTITION_ROWS) -> BatchResult:
+    """
+    Score a large CSV, Parquet or Arrow file across worker processes.
+
+    Each partition is read, scored and aggregated in its own process; the
+    partial LeadStats (counts, histograms, correlation sums) are merged and the
+    scored rows written to output (.csv or .parquet) in their original order.
+    """
+    started = time.perf_counter()
+    fmt = fmt or detect_format(path)
+    available = read_column_names(path, fmt)
+    missing = [col for col in FEATURE_COLUMNS if col not in available]
+    if missing:
+        raise MissingColumnsError(missing)
+
+    output_fmt = None
+    if output is not None:
+        extension = os.path.splitext(output)[1].lower()
+        if extension not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output type '{extension}'. Supported: {', '.join(OUTPUT_FORMATS)}")
+        output_fmt = OUTPUT_FORMATS[extension]
+
+    partitions = plan_partitions(path, fmt, partition_bytes=partition_bytes, partition_rows=partition_rows)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(partitions) or 1))
+    stats = LeadStats(model)
+
+    with tempfile.TemporaryDirectory(prefix="scoring-") as part_dir:
+        tasks = [(partition, model, columns, part_dir if output else None, output_fmt or 'csv')
+                 for partition in partitions]
+        if workers == 1:
+            results = [_score_partition_task(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_score_partition_task, tasks))
+
+        for result in results:
+            stats.merge(result.stats)
+        if stats.count == 0:
+            raise ValueError("The file contains no rows to score")
+        if output is not None:
+            _merge_parts(results, output, output_fmt)
+
+    return BatchResult(source=path, stats=stats, partitions=len(partitions), workers=workers,
+                       seconds=time.perf_counter() - started, output=output)
+
+
+def _output_path(path, output_dir, output_fmt):
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(output_dir, f"{name}_scored.{output_fmt}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score lead files in parallel and summarize the results.")
+    parser.add_argument("inputs", nargs="+", help="CSV, Parquet or Arrow files to score")
+    parser.add_argument("--output-dir", help="write <name>_scored.<format> for each input here")
+    parser.add_argument("--output-format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--model", choices=sorted(MODELS), default="standard")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--partition-mb", type=int, default=DEFAULT_PARTITION_BYTES // (1024 * 1024))
+    parser.add_argument("--partition-rows", type=int, default=DEFAULT_PARTITION_ROWS)
+    parser.add_argument("--summary", help="write the JSON summary of every input here instead of stdout")
+    args = parser.parse_args(argv)
+
+    model = get_model(args.model)
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    summaries = []
+    total = LeadStats(model)
+    failed = 0
+    for path in args.inputs:
+        output = _output_path(path, args.output_dir, args.output_format) if args.output_dir else None
+        try:
+            result = score_file_parallel(path, output=output, model=model, workers=args.workers,
+                                         partition_bytes=args.partition_mb * 1024 * 1024,
+                                         partition_rows=args.partition_rows)
+        except (OSError, ValueError) as e:
+            print(f"Failed to score {path}: {e}", file=sys.stderr)
+            summaries.append({"source": path, "error": str(e)})
+            failed += 1
+            continue
+        total.merge(result.stats)
+        summaries.append(result.summary())
+        print(f"Scored {result.rows:,} leads from {path} in {result.seconds:.1f}s "
+              f"({result.partitions} partitions, {result.workers} workers)", file=sys.stderr)
+
+    report = json.dumps({"files": summaries, "total": {"rows": total.count, **stats_summary(total)}}, indent=2)
+    if args.summary:
+        with open(args.summary, 'w') as f:
+            f.write(report)
+    else:
+        print(report)
+    return 1 if failed else 0
@@ -0,0 +1,136 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import pandas as pd
+
+from scoring.model import ScoringModel, STANDARD_MODEL
+from scoring.dtypes import NormalizationReport, normalize_frame
+from scoring.index import ScoreIndex
+from scoring.stats import LeadStats
+
+# Total size of cached scored frames before the least recently used ones are dropped
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+DEFAULT_CACHE_ENTRIES = 16
+
+# Block size used when hashing file-like sources
+HASH_BLOCK_BYTES = 1024 * 1024
+
+
+@dataclass
+class ScoredDataset:
+    """A parsed and scored dataset together with its precomputed aggregates"""
+
+    frame: pd.DataFrame
+    stats: LeadStats
+    index: ScoreIndex
+    memory: NormalizationReport
+
+    @classmethod
+    def from_frame(cls, df, model: ScoringModel = STANDARD_MODEL, index_columns=('lead_category',)):
+        """Score a parsed frame in place, build its summary statistics and filter index, then compact it"""
+        df['lead_score'] = model.score_frame(df)
+        df['lead_category'] = model.categorize(df['lead_score'])
+        # Aggregates and the index see the full precision scores before downcasting
+        stats = LeadStats.from_frame(df, model)
+        index = ScoreIndex.from_frame(df, columns=index_columns)
+        memory = normalize_frame(df, labels=model.labels)
+        return cls(frame=df, stats=stats, index=index, memory=memory)
+
+    @property
+    def nbytes(self):
+        return int(self.frame.memory_usage(index=True, deep=True).sum()) + self.index.nbytes
+
+
+def content_key(source, model: ScoringModel = STANDARD_MODEL, *parts):
+    """Cache key for an upload: hash of its bytes and any extra parts (e.g. the columns read), plus the model version"""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode())
+        digest.update(b'\0')
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+    elif hasattr(source, 'getbuffer'):
+        # In-memory uploads are hashed in place without copying their bytes
+        with source.getbuffer() as buffer:
+            digest.update(buffer)
+    else:
+        position = source.tell()
+        source.seek(0)
+        for block in iter(lambda: source.read(HASH_BLOCK_BYTES), b''):
+            digest.update(block)
+        source.seek(position)
+    return f"{digest.hexdigest()}-{model.version}"
+
+
+class ScoredDatasetCache:
+    """
+    Thread-safe LRU cache of scored datasets with a memory budget.
+
+    Keys are content hashes (see content_key), so the same file uploaded again,
+    from any session, is served without parsing or scoring it a second time.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES, max_entries=DEFAULT_CACHE_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, nbytes=None):
+        if nbytes is None:
+            nbytes = value.nbytes
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._sizes[key]
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._sizes[key] = nbytes
+            self.current_bytes += nbytes
+            self._evict()
+        return value
+
+    def get_or_build(self, key, build):
+        """Return the cached value for key, building and caching it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, build())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.current_bytes = 0
+
+    def _evict(self):
+        # The newest entry always stays, even if it alone exceeds the budget
+        while len(self._entries) > 1 and (self.current_bytes > self.max_bytes
+                                          or len(self._entries) > self.max_entries):
+            key, _ = self._entries.popitem(last=False)
+            self.current_bytes -= self._sizes.pop(key)
+
+
+# Process-wide cache shared by every dashboard session
+scored_datasets = ScoredDatasetCache()
@@ -0,0 +1,81 @@
+import numpy as np
+
+
+class CorrelationStats:
+    """
+    Means and co-moments of several columns, accumulated in one pass over chunks.
+
+    Chunks (or stats from other workers) are combined with the pairwise update of
+    Chan et al., which stays accurate where raw sums of squares would cancel out,
+    and the covariance and correlation matrices are read from the k x k sums.
+    """
+
+    def __init__(self, n_columns):
+        self.count = 0
+        self.mean = np.zeros(n_columns)
+        self.comoment = np.zeros((n_columns, n_columns))
+
+    @property
+    def n_columns(self):
+        return len(self.mean)
+
+    def _combine(self, count, mean, comoment):
+        if count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.comoment = count, mean.copy(), comoment.copy()
+            return self
+        total = self.count + count
+        delta = mean - self.mean
+        self.comoment = self.comoment + comoment + np.outer(delta, delta) * (self.count * count / total)
+        self.mean = self.mean + delta * (count / total)
+        self.count = total
+        return self
+
+    def update(self, values):
+        """Add a chunk given as an (n_rows, n_columns) array"""
+        values = np.asarray(values, dtype=np.float64)
+        if values.ndim != 2 or values.shape[1] != self.n_columns:
+            raise ValueError(f"Expected an array with {self.n_columns} columns, got shape {values.shape}")
+        if len(values) == 0:
+            return self
+        mean = values.mean(axis=0)
+        centered = values - mean
+        return self._combine(len(values), mean, centered.T @ centered)
+
+    def merge(self, other):
+        """Fold the statistics of another chunk, file or worker into these"""
+        if other.n_columns != self.n_columns:
+            raise ValueError("Cannot merge correlation statistics over different columns")
+        return self._combine(other.count, other.mean, other.comoment)
+
+    def covariance(self, ddof=1):
+        if self.count - ddof <= 0:
+            return np.full((self.n_columns, self.n_columns), np.nan)
+        return self.comoment / (self.count - ddof)
+
+    def variance(self, ddof=1):
+        return np.diag(self.covariance(ddof))
+
+    def correlation(self):
+        """Pearson correlation matrix; NaN where a column is constant"""
+        if self.count < 2:
+            return np.full((self.n_columns, self.n_columns), np.nan)
+        scale = np.sqrt(np.diag(self.comoment))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.comoment / np.outer(scale, scale)
+
+
+def linear_combination_correlations(covariance, weights):
+    """
+    Correlation of each column with the weighted sum of all columns, from their covariance matrix.
+
+    For s = w . x, cov(x_i, s) = (C w)_i and var(s) = w' C w, so a linear score's
+    correlations follow from the k x k matrix without computing the score itself.
+    Scaling the weights or adding an offset to the score does not change them.
+    """
+    covariance = np.asarray(covariance, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    cross = covariance @ weights
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return cross / np.sqrt(np.diag(covariance) * (weights @ cross))
@@ -0,0 +1,132 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+from scoring.engine import FEATURE_COLUMNS
+
+# Compact storage types for scored data
+FEATURE_DTYPE = np.uint8
+SCORE_DTYPE = np.float32
+
+# Valid range of every feature score
+FEATURE_MIN = 0
+FEATURE_MAX = 100
+
+# Text columns with at most this share of distinct values are stored as categoricals
+CATEGORICAL_MAX_UNIQUE_RATIO = 0.5
+
+
+@dataclass
+class NormalizationReport:
+    """What normalize_frame changed, and the memory it saved"""
+
+    bytes_before: int
+    bytes_after: int
+    out_of_range: Dict[str, int] = field(default_factory=dict)
+    downcast: List[str] = field(default_factory=list)
+    categorical: List[str] = field(default_factory=list)
+
+    @property
+    def ratio(self):
+        return self.bytes_before / self.bytes_after if self.bytes_after else float('nan')
+
+    def summary(self):
+        return (f"Memory: {format_bytes(self.bytes_before)} → {format_bytes(self.bytes_after)} "
+                f"({self.ratio:.1f}x smaller)")
+
+
+def format_bytes(nbytes):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if nbytes < 1024 or unit == 'GB':
+            return f"{nbytes:.0f} {unit}" if unit == 'B' else f"{nbytes:.1f} {unit}"
+        nbytes /= 1024
+
+
+def frame_nbytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def feature_range_violations(df):
+    """Number of missing or out-of-range (outside 0-100) values in each feature column that has any"""
+    violations = {}
+    for col in FEATURE_COLUMNS:
+        if col not in df.columns:
+            continue
+        values = pd.to_numeric(df[col], errors='coerce')
+        bad = int((values.isna() | (values < FEATURE_MIN) | (values > FEATURE_MAX)).sum())
+        if bad:
+            violations[col] = bad
+    return violations
+
+
+def _is_whole_feature_column(series):
+    """True when every value is a whole number within the valid feature range"""
+    if not ptypes.is_numeric_dtype(series) or series.isna().any():
+        return False
+    if series.empty:
+        return True
+    values = series.to_numpy()
+    if ptypes.is_float_dtype(series) and not np.all(np.mod(values, 1) == 0):
+        return False
+    return values.min() >= FEATURE_MIN and values.max() <= FEATURE_MAX
+
+
+def _is_repetitive_text(series):
+    if not (ptypes.is_object_dtype(series) or ptypes.is_string_dtype(series)) \
+            or isinstance(series.dtype, pd.CategoricalDtype) or series.empty:
+        return False
+    try:
+        return series.nunique(dropna=True) <= max(1, len(series) * CATEGORICAL_MAX_UNIQUE_RATIO)
+    except TypeError:
+        # Unhashable values (lists, dicts) cannot be categorical
+        return False
+
+
+def compact_dtype_map(df, labels=None):
+    """
+    Compact dtypes for the scoring columns of df: uint8 feature scores (when every
+    value is a whole number in 0-100), float32 lead score and a categorical
+    lead_category with a fixed category order.
+    """
+    dtypes = {}
+    for col in FEATURE_COLUMNS:
+        if col in df.columns and _is_whole_feature_column(df[col]):
+            dtypes[col] = FEATURE_DTYPE
+    if 'lead_score' in df.columns:
+        dtypes['lead_score'] = SCORE_DTYPE
+    if 'lead_category' in df.columns:
+        categories = list(labels) if labels is not None else sorted(df['lead_category'].dropna().unique())
+        dtypes['lead_category'] = pd.CategoricalDtype(categories)
+    return dtypes
+
+
+def normalize_frame(df, labels=None):
+    """
+    Validate and downcast a (scored) frame to compact dtypes, in place.
+
+    Feature scores become uint8, lead_score float32, lead_category and other
+    repetitive text columns categorical. Feature columns with missing, fractional
+    or out-of-range values are reported and left as they are.
+    """
+    bytes_before = frame_nbytes(df)
+    out_of_range = feature_range_violations(df)
+
+    dtypes = compact_dtype_map(df, labels=labels)
+    for col in df.columns:
+        if col not in dtypes and _is_repetitive_text(df[col]):
+            dtypes[col] = 'category'
+
+    changed = {col: dtype for col, dtype in dtypes.items() if df[col].dtype != dtype}
+    for col, dtype in changed.items():
+        df[col] = df[col].astype(dtype)
+
+    return NormalizationReport(
+        bytes_before=bytes_before,
+        bytes_after=frame_nbytes(df),
+        out_of_range=out_of_range,
+        downcast=[col for col, dtype in changed.items() if dtype != 'category'],
+        categorical=[col for col, dtype in changed.items() if dtype == 'category']
+    )
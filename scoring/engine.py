@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+# Feature columns in the order the weights are applied
+FEATURE_COLUMNS = [
+    'location_score', 'how_you_know_us_score', 'sibling_in_school_score',
+    'previous_school_name_score', 'class_applied_for_score',
+    'last_class_percentage_score', 'communication_email_different_score',
+    'whatsapp_number_different_score'
+]
+
+# Weights for each factor
+WEIGHTS = (0.85, 0.70, 0.95, 0.55, 0.50, 0.25, 0.25, 0.20)
+
+# Category thresholds, highest first
+HOT_THRESHOLD = 80
+WARM_THRESHOLD = 60
+
+
+def score_matrix(features, weights=WEIGHTS, offset=0.0, decimals=None):
+    """Score an (n_rows, 8) feature matrix in one vectorized pass"""
+    features = np.asarray(features, dtype=np.float64)
+    if features.ndim == 1:
+        features = features.reshape(1, -1)
+
+    # Accumulate the weighted columns left to right so every row sees exactly
+    # the same floating point operations as the original per-row sum()
+    weighted_sum = np.zeros(features.shape[0], dtype=np.float64)
+    for i, weight in enumerate(weights):
+        weighted_sum += features[:, i] * weight
+
+    lead_score = weighted_sum / sum(weights)
+
+    if decimals is not None:
+        lead_score = np.round(lead_score, decimals)
+
+    return lead_score + offset if offset else lead_score
+
+
+def score_frame(df, weights=WEIGHTS, offset=0.0, decimals=None):
+    """Score every row of a DataFrame holding the eight feature columns"""
+    lead_score = score_matrix(df[FEATURE_COLUMNS].to_numpy(dtype=np.float64),
+                              weights=weights, offset=offset, decimals=decimals)
+    return pd.Series(lead_score, index=df.index, name='lead_score')
+
+
+def category_codes(scores, hot_threshold=HOT_THRESHOLD, warm_threshold=WARM_THRESHOLD):
+    """Map scores to category codes: 0 = hot, 1 = warm, 2 = cold"""
+    scores = np.asarray(scores)
+    return np.select(
+        [scores >= hot_threshold, scores >= warm_threshold],
+        [0, 1],
+        default=2
+    ).astype(np.int8)
+
+
+def categorize_scores(scores, labels=("Hot Lead", "Warm Lead", "Cold Lead"),
+                      hot_threshold=HOT_THRESHOLD, warm_threshold=WARM_THRESHOLD):
+    """Categorize an array of scores with np.select instead of a per-row apply"""
+    scores = np.asarray(scores)
+    hot, warm, cold = labels
+    return np.select(
+        [scores >= hot_threshold, scores >= warm_threshold],
+        [hot, warm],
+        default=cold
+    )
+
+
+def calculate_lead_score(location_score, how_you_know_us_score, sibling_in_school_score,
+                         previous_school_name_score, class_applied_for_score,
+                         last_class_percentage_score, communication_email_different_score,
+                         whatsapp_number_different_score, offset=0.0, decimals=None):
+    """Calculate a single lead score through the same path as bulk scoring"""
+    scores = [location_score, how_you_know_us_score, sibling_in_school_score,
+              previous_school_name_score, class_applied_for_score,
+              last_class_percentage_score, communication_email_different_score,
+              whatsapp_number_different_score]
+    return float(score_matrix(scores, offset=offset, decimals=decimals)[0])
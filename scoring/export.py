@@ -0,0 +1,82 @@
+import tempfile
+
+import numpy as np
+
+from scoring.dtypes import compact_dtype_map
+from scoring.stream import SPOOL_MAX_BYTES
+
+# Rows converted and written per step when exporting
+EXPORT_CHUNK_ROWS = 100_000
+
+# Supported export formats: MIME type and file extension
+EXPORT_FORMATS = {
+    'csv': ('text/csv', '.csv'),
+    'parquet': ('application/vnd.apache.parquet', '.parquet'),
+    'arrow': ('application/vnd.apache.arrow.file', '.arrow'),
+}
+
+
+def iter_row_chunks(df, positions=None, columns=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Yield the selected rows of df, in the given order, a bounded chunk at a time"""
+    if positions is None:
+        positions = np.arange(len(df))
+    if columns is not None:
+        df = df[columns]
+    for start in range(0, len(positions), chunk_rows):
+        yield df.take(positions[start:start + chunk_rows])
+
+
+def export_rows(df, positions=None, fmt='csv', columns=None, labels=None, chunk_rows=EXPORT_CHUNK_ROWS,
+                spool_max_bytes=SPOOL_MAX_BYTES):
+    """
+    Write the selected rows to a spooled temp file, chunk by chunk, and return it rewound.
+
+    Only one chunk is converted at a time, so the export never holds a second
+    full copy of the data (or a full CSV string) in memory. Parquet and Arrow
+    output use compact column types (see compact_dtype_map); labels fixes the
+    category order of lead_category.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}'. Available: {', '.join(EXPORT_FORMATS)}")
+
+    output = tempfile.SpooledTemporaryFile(max_size=spool_max_bytes, mode='w+b')
+    chunks = iter_row_chunks(df, positions, columns=columns, chunk_rows=chunk_rows)
+
+    if fmt == 'csv':
+        header = True
+        for chunk in chunks:
+            chunk.to_csv(output, header=header, index=False)
+            header = False
+        if header:
+            # No rows selected: still emit the header line
+            df[columns if columns is not None else df.columns].head(0).to_csv(output, index=False)
+    else:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Decided once over the whole frame so every chunk gets the same schema
+        dtypes = compact_dtype_map(df if columns is None else df[columns], labels=labels)
+        schema = None
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk.astype(dtypes), schema=schema, preserve_index=False)
+                if writer is None:
+                    schema = table.schema
+                    writer = pq.ParquetWriter(output, schema) if fmt == 'parquet' \
+                        else pa.ipc.new_file(output, schema)
+                writer.write_table(table)
+            if writer is None:
+                empty = df[columns if columns is not None else df.columns].head(0).astype(dtypes)
+                table = pa.Table.from_pandas(empty, preserve_index=False)
+                if fmt == 'parquet':
+                    pq.write_table(table, output)
+                else:
+                    with pa.ipc.new_file(output, table.schema) as empty_writer:
+                        empty_writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    output.seek(0)
+    return output
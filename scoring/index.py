@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+
+class ScoreIndex:
+    """
+    Lead scores sorted once, with the row permutation and per-column value codes.
+
+    A score range query is two binary searches over the sorted scores; category
+    and class filters are then a single table lookup over the rows inside that
+    range only, instead of several boolean masks over the whole frame.
+    """
+
+    def __init__(self, scores, **columns):
+        scores = np.asarray(scores, dtype=np.float64)
+        self.order = np.argsort(scores, kind='stable')
+        self.sorted_scores = scores[self.order]
+
+        # Each filter column is stored as small integer codes in score order,
+        # plus the mapping from value to code
+        self._codes = {}
+        self._values = {}
+        for name, values in columns.items():
+            codes, uniques = pd.factorize(np.asarray(values, dtype=object)[self.order], use_na_sentinel=False)
+            dtype = np.int8 if len(uniques) < 127 else np.int32
+            self._codes[name] = codes.astype(dtype)
+            self._values[name] = {value: code for code, value in enumerate(uniques)}
+
+    @classmethod
+    def from_frame(cls, df, columns=('lead_category',)):
+        return cls(df['lead_score'].to_numpy(), **{col: df[col].to_numpy() for col in columns})
+
+    def __len__(self):
+        return len(self.order)
+
+    @property
+    def nbytes(self):
+        return (self.order.nbytes + self.sorted_scores.nbytes
+                + sum(codes.nbytes for codes in self._codes.values()))
+
+    def values(self, column):
+        """Distinct values of an indexed column"""
+        return list(self._values[column])
+
+    def _range(self, lo, hi):
+        start = 0 if lo is None else int(np.searchsorted(self.sorted_scores, lo, side='left'))
+        stop = len(self.order) if hi is None else int(np.searchsorted(self.sorted_scores, hi, side='right'))
+        return start, max(start, stop)
+
+    def _mask(self, start, stop, filters):
+        """Boolean mask over sorted positions start:stop, or None when no filter narrows it"""
+        mask = None
+        for name, allowed in filters.items():
+            if allowed is None:
+                continue
+            value_codes = self._values[name]
+            wanted = [value_codes[value] for value in allowed if value in value_codes]
+            if len(wanted) == len(value_codes):
+                continue
+
+            lookup = np.zeros(len(value_codes), dtype=bool)
+            lookup[wanted] = True
+            column_mask = lookup[self._codes[name][start:stop]]
+            mask = column_mask if mask is None else mask & column_mask
+        return mask
+
+    def query(self, lo=None, hi=None, sort_by_score=False, **filters):
+        """
+        Row positions with lo <= score <= hi whose indexed columns take one of the allowed values.
+
+        Positions come back in original row order, or ascending by score when
+        sort_by_score is set (a zero-copy view when no column filter applies).
+        """
+        start, stop = self._range(lo, hi)
+        positions = self.order[start:stop]
+        mask = self._mask(start, stop, filters)
+        if mask is not None:
+            positions = positions[mask]
+        return positions if sort_by_score else np.sort(positions)
+
+    def count(self, lo=None, hi=None, **filters):
+        """Number of rows a query would return, without materializing them"""
+        start, stop = self._range(lo, hi)
+        mask = self._mask(start, stop, filters)
+        return stop - start if mask is None else int(np.count_nonzero(mask))
+
+    def select(self, df, lo=None, hi=None, sort_by_score=False, **filters):
+        """Rows of the indexed frame matching a query; the frame itself when nothing is filtered out"""
+        positions = self.query(lo, hi, sort_by_score=sort_by_score, **filters)
+        if len(positions) == len(df) and not sort_by_score:
+            return df
+        return df.take(positions)
@@ -0,0 +1,109 @@
+import os
+
+import pandas as pd
+
+from scoring.engine import FEATURE_COLUMNS
+
+# Input formats recognised by file extension
+FORMAT_EXTENSIONS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.ipc': 'arrow',
+}
+
+# Extensions accepted by the dashboards' upload widgets
+UPLOAD_TYPES = [extension.lstrip('.') for extension in FORMAT_EXTENSIONS]
+
+
+def detect_format(name):
+    """Input format of a file from its name: 'csv', 'parquet' or 'arrow'"""
+    extension = os.path.splitext(str(name))[1].lower()
+    try:
+        return FORMAT_EXTENSIONS[extension]
+    except KeyError:
+        raise ValueError(f"Unsupported file type '{extension}'. "
+                         f"Supported: {', '.join(FORMAT_EXTENSIONS)}") from None
+
+
+def _rewind(source):
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+
+def _arrow_reader(source):
+    """Open an Arrow IPC file, falling back to the IPC stream format"""
+    import pyarrow.ipc as ipc
+
+    try:
+        return ipc.open_file(source)
+    except Exception:
+        _rewind(source)
+        return ipc.open_stream(source)
+
+
+def read_column_names(source, fmt):
+    """Column names of a file, reading only its header, footer or schema"""
+    _rewind(source)
+    try:
+        if fmt == 'csv':
+            return list(pd.read_csv(source, nrows=0).columns)
+        if fmt == 'parquet':
+            import pyarrow.parquet as pq
+            return pq.read_schema(source).names
+        return _arrow_reader(source).schema.names
+    finally:
+        _rewind(source)
+
+
+def projected_columns(available, passthrough=None):
+    """Columns to read: the feature columns present plus the requested passthrough columns, in file order"""
+    if passthrough is None:
+        return list(available)
+    keep = set(FEATURE_COLUMNS) | set(passthrough)
+    return [col for col in available if col in keep]
+
+
+def read_table(source, fmt='csv', columns=None, **read_csv_kwargs):
+    """
+    Read a whole CSV, Parquet or Arrow IPC file into a DataFrame.
+
+    Columnar formats only read the requested columns from disk, and their integer
+    and dictionary types come through as-is instead of being re-parsed from text.
+    """
+    _rewind(source)
+    if fmt == 'csv':
+        return pd.read_csv(source, usecols=columns, **read_csv_kwargs)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        table = pq.read_table(source, columns=columns)
+    else:
+        table = _arrow_reader(source).read_all()
+        if columns is not None:
+            table = table.select(columns)
+    return table.to_pandas()
+
+
+def iter_table_chunks(source, fmt='csv', chunksize=50_000, columns=None, **read_csv_kwargs):
+    """Yield a CSV, Parquet or Arrow IPC file as DataFrames of at most chunksize rows"""
+    _rewind(source)
+    if fmt == 'csv':
+        with pd.read_csv(source, chunksize=chunksize, usecols=columns, **read_csv_kwargs) as reader:
+            yield from reader
+    elif fmt == 'parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize, columns=columns):
+            yield batch.to_pandas()
+    else:
+        import pyarrow as pa
+        reader = _arrow_reader(source)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches)) \
+            if hasattr(reader, 'num_record_batches') else reader
+        for batch in batches:
+            if columns is not None:
+                batch = batch.select(columns)
+            table = pa.Table.from_batches([batch])
+            for start in range(0, table.num_rows, chunksize):
+                yield table.slice(start, chunksize).to_pandas()
@@ -0,0 +1,123 @@
+import hashlib
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from scoring.engine import (
+    FEATURE_COLUMNS, WEIGHTS, HOT_THRESHOLD, WARM_THRESHOLD,
+    score_matrix, category_codes, categorize_scores
+)
+
+# Human readable descriptions of each factor, used by the About tab
+FEATURE_DESCRIPTIONS = {
+    'location_score': 'Proximity to school location',
+    'how_you_know_us_score': 'Source of school awareness',
+    'sibling_in_school_score': 'Whether student has siblings in school',
+    'previous_school_name_score': 'Quality of previous school',
+    'class_applied_for_score': 'Grade level applying for',
+    'last_class_percentage_score': 'Academic performance',
+    'communication_email_different_score': 'Email consistency check',
+    'whatsapp_number_different_score': 'Phone number consistency check'
+}
+
+UNKNOWN_COLOR = "#808080"
+
+
+@dataclass(frozen=True)
+class ScoringModel:
+    """Weights, offset, rounding, thresholds and colors of one scoring formula"""
+
+    name: str = "standard"
+    weights: Tuple[float, ...] = WEIGHTS
+    offset: float = 0.0
+    decimals: Optional[int] = None
+    hot_threshold: float = HOT_THRESHOLD
+    warm_threshold: float = WARM_THRESHOLD
+    labels: Tuple[str, str, str] = ("Hot Lead", "Warm Lead", "Cold Lead")
+    colors: Tuple[str, str, str] = ("#FF4B4B", "#FFA500", "#4B8BFF")
+    total_weight: float = field(init=False, repr=False)
+    version: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if len(self.weights) != len(FEATURE_COLUMNS):
+            raise ValueError(f"Expected {len(FEATURE_COLUMNS)} weights, got {len(self.weights)}")
+        if len(self.labels) != 3 or len(self.colors) != 3:
+            raise ValueError("A scoring model needs exactly three labels and three colors")
+
+        # Everything derived from the parameters is computed once here
+        object.__setattr__(self, 'weights', tuple(float(w) for w in self.weights))
+        object.__setattr__(self, 'total_weight', sum(self.weights))
+        params = json.dumps([self.weights, self.offset, self.decimals,
+                             self.hot_threshold, self.warm_threshold, list(self.labels)])
+        object.__setattr__(self, 'version', hashlib.sha1(params.encode()).hexdigest()[:12])
+
+    @property
+    def hot_label(self):
+        return self.labels[0]
+
+    @property
+    def warm_label(self):
+        return self.labels[1]
+
+    @property
+    def cold_label(self):
+        return self.labels[2]
+
+    @property
+    def color_map(self) -> Dict[str, str]:
+        return dict(zip(self.labels, self.colors))
+
+    def score(self, features) -> np.ndarray:
+        """Score an (n_rows, 8) matrix or a DataFrame holding the feature columns"""
+        if isinstance(features, pd.DataFrame):
+            features = features[FEATURE_COLUMNS].to_numpy(dtype=np.float64)
+        return score_matrix(features, weights=self.weights, offset=self.offset, decimals=self.decimals)
+
+    def score_frame(self, df) -> pd.Series:
+        """Score a DataFrame, returning a lead_score Series aligned with its index"""
+        return pd.Series(self.score(df), index=df.index, name='lead_score')
+
+    def score_one(self, *scores) -> float:
+        """Score a single lead given its eight feature scores in column order"""
+        return float(self.score(scores)[0])
+
+    def category_codes(self, scores) -> np.ndarray:
+        """Category index of each score into labels/colors (0 = hot, 1 = warm, 2 = cold)"""
+        return category_codes(scores, hot_threshold=self.hot_threshold, warm_threshold=self.warm_threshold)
+
+    def categorize(self, scores) -> np.ndarray:
+        return categorize_scores(scores, labels=self.labels,
+                                 hot_threshold=self.hot_threshold, warm_threshold=self.warm_threshold)
+
+    def categorize_one(self, score) -> str:
+        return str(self.categorize([score])[0])
+
+    def color(self, category) -> str:
+        return self.color_map.get(category, UNKNOWN_COLOR)
+
+
+# Formula used by the Lead Scoring System dashboard (app.py) and the API
+STANDARD_MODEL = ScoringModel()
+
+# Formula used by the ENTAB sample data dashboard (app1.py)
+ENTAB_MODEL = ScoringModel(
+    name="entab",
+    offset=5,
+    decimals=2,
+    labels=("🔥 Hot Lead", "🟡 Warm Lead", "❄️ Cold Lead")
+)
+
+MODELS = {model.name: model for model in (STANDARD_MODEL, ENTAB_MODEL)}
+
+
+@lru_cache(maxsize=None)
+def get_model(name="standard") -> ScoringModel:
+    """Look up a registered scoring model by name"""
+    try:
+        return MODELS[name]
+    except KeyError:
+        raise ValueError(f"Unknown scoring model '{name}'. Available: {', '.join(MODELS)}") from None
@@ -0,0 +1,162 @@
+import numpy as np
+
+from scoring.correlation import CorrelationStats, linear_combination_correlations
+from scoring.engine import FEATURE_COLUMNS
+from scoring.model import ScoringModel, STANDARD_MODEL
+
+# Same bin count the dashboards use for their score histograms
+HISTOGRAM_BINS = 20
+
+
+class LeadStats:
+    """
+    Summary metrics of scored leads, accumulated incrementally chunk by chunk.
+
+    Everything kept here is a sum or a count, so stats built from separate chunks
+    (or separate workers) can be merged, and rendering the dashboard metrics and
+    charts only touches the fixed-size arrays, never the rows themselves.
+    """
+
+    def __init__(self, model: ScoringModel = STANDARD_MODEL, bins=HISTOGRAM_BINS):
+        self.model = model
+        # Scores live in [0, 100] before the model's offset is added
+        self.bin_edges = np.linspace(model.offset, 100 + model.offset, bins + 1)
+        self.count = 0
+        # Leads with a finite score; a missing feature leaves a lead unscored (NaN), and such
+        # leads are counted (as cold, like the row-by-row dashboards did) but kept out of the score sums
+        self.scored = 0
+        # Leads whose feature matrix was passed in, to tell whether the correlations cover every chunk
+        self.feature_rows = 0
+        self.score_sum = 0.0
+        self.score_sq_sum = 0.0
+        self.score_min = np.inf
+        self.score_max = -np.inf
+        self.category_counts = np.zeros(3, dtype=np.int64)
+        # One histogram row per category so charts can stay colored by category
+        self.histogram = np.zeros((3, bins), dtype=np.int64)
+
+        # Means and co-moments of the features followed by the score, for the
+        # feature vs score correlations and the feature correlation matrix;
+        # only complete rows are added, like pandas' NaN-skipping corr
+        self.moments = CorrelationStats(len(FEATURE_COLUMNS) + 1)
+
+    @classmethod
+    def from_frame(cls, df, model: ScoringModel = STANDARD_MODEL, bins=HISTOGRAM_BINS):
+        return cls(model, bins=bins).update_frame(df)
+
+    def update(self, scores, codes=None, features=None):
+        """Add a chunk of lead scores, optionally with their category codes and feature matrix"""
+        scores = np.asarray(scores, dtype=np.float64)
+        if scores.size == 0:
+            return self
+        if codes is None:
+            codes = self.model.category_codes(scores)
+
+        codes = np.asarray(codes)
+        self.count += scores.size
+        self.category_counts += np.bincount(codes, minlength=3)
+
+        finite = np.isfinite(scores)
+        if features is not None:
+            features = np.asarray(features, dtype=np.float64)
+            self.feature_rows += scores.size
+            complete = finite & np.isfinite(features).all(axis=1)
+            self.moments.update(np.column_stack([features[complete], scores[complete]]))
+        if not finite.all():
+            scores, codes = scores[finite], codes[finite]
+            if scores.size == 0:
+                return self
+
+        self.scored += scores.size
+        self.score_sum += float(scores.sum())
+        self.score_sq_sum += float(scores @ scores)
+        self.score_min = min(self.score_min, float(scores.min()))
+        self.score_max = max(self.score_max, float(scores.max()))
+
+        # Fixed edges, so the bin of every score is known without sorting;
+        # the top edge is inclusive like np.histogram
+        bins = self.histogram.shape[1]
+        bin_index = np.searchsorted(self.bin_edges, scores, side='right') - 1
+        bin_index = np.clip(bin_index, 0, bins - 1)
+        flat_index = codes.astype(np.int64) * bins + bin_index
+        self.histogram += np.bincount(flat_index, minlength=3 * bins).reshape(3, bins)
+        return self
+
+    def update_frame(self, df):
+        """Add a scored (or unscored) DataFrame chunk holding the feature columns"""
+        scores = df['lead_score'].to_numpy() if 'lead_score' in df.columns else self.model.score(df)
+        return self.update(scores, features=df[FEATURE_COLUMNS].to_numpy(dtype=np.float64))
+
+    def merge(self, other):
+        """Fold another LeadStats (e.g. from another chunk or worker) into this one"""
+        if other.model != self.model or not np.array_equal(other.bin_edges, self.bin_edges):
+            raise ValueError("Cannot merge LeadStats built with different models or bins")
+
+        self.count += other.count
+        self.scored += other.scored
+        self.feature_rows += other.feature_rows
+        self.score_sum += other.score_sum
+        self.score_sq_sum += other.score_sq_sum
+        self.score_min = min(self.score_min, other.score_min)
+        self.score_max = max(self.score_max, other.score_max)
+        self.category_counts += other.category_counts
+        self.histogram += other.histogram
+        self.moments.merge(other.moments)
+        return self
+
+    @property
+    def mean(self):
+        return self.score_sum / self.scored if self.scored else float('nan')
+
+    def category_count(self, label):
+        return int(self.category_counts[self.model.labels.index(label)])
+
+    @property
+    def hot(self):
+        return int(self.category_counts[0])
+
+    @property
+    def warm(self):
+        return int(self.category_counts[1])
+
+    @property
+    def cold(self):
+        return int(self.category_counts[2])
+
+    def _correlation_matrix(self):
+        if self.moments.count < 2:
+            n = len(FEATURE_COLUMNS) + 1
+            return np.full((n, n), np.nan)
+        if self.feature_rows != self.count:
+            raise ValueError("Feature sums were only collected for part of the scores")
+        return self.moments.correlation()
+
+    def feature_correlations(self):
+        """Pearson correlation of each feature with the lead score, in FEATURE_COLUMNS order"""
+        return self._correlation_matrix()[-1, :-1]
+
+    def feature_correlation_matrix(self):
+        """Pearson correlation between every pair of features, in FEATURE_COLUMNS order"""
+        return self._correlation_matrix()[:-1, :-1]
+
+    @property
+    def feature_means(self):
+        return self.moments.mean[:-1] if self.moments.count else np.full(len(FEATURE_COLUMNS), np.nan)
+
+    def feature_covariance(self):
+        """Covariance matrix of the features, in FEATURE_COLUMNS order"""
+        return self.moments.covariance()[:-1, :-1]
+
+    def weighted_feature_correlations(self):
+        """
+        Correlation of each feature with the lead score, derived from the feature
+        covariance matrix and the model weights instead of the scores. Matches
+        feature_correlations exactly unless the model rounds its scores.
+        """
+        if self.moments.count < 2:
+            return np.full(len(FEATURE_COLUMNS), np.nan)
+        return linear_combination_correlations(self.feature_covariance(), self.model.weights)
+
+    def feature_contributions(self):
+        """Points each feature adds to the average score (weight x mean / total weight); they sum to mean - offset"""
+        return np.asarray(self.model.weights) * self.feature_means / self.model.total_weight
@@ -0,0 +1,89 @@
+import tempfile
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+
+from scoring.engine import FEATURE_COLUMNS
+from scoring.io import iter_table_chunks
+from scoring.model import ScoringModel, STANDARD_MODEL
+from scoring.stats import LeadStats
+
+# Rows read, scored and written per step; bounds peak memory independent of file size
+DEFAULT_CHUNK_ROWS = 50_000
+
+# Scored output stays in memory up to this size, then spills to a temp file on disk
+SPOOL_MAX_BYTES = 32 * 1024 * 1024
+
+
+class MissingColumnsError(ValueError):
+    """Raised when an input file lacks some of the required feature columns"""
+
+    def __init__(self, missing):
+        self.missing = list(missing)
+        super().__init__(f"Missing required columns: {', '.join(self.missing)}")
+
+
+@dataclass
+class StreamResult:
+    """Outcome of a streaming scoring run"""
+
+    stats: LeadStats
+    preview: pd.DataFrame
+    output: Optional[tempfile.SpooledTemporaryFile] = None
+
+    @property
+    def rows(self):
+        return self.stats.count
+
+    def open_output(self):
+        """Rewind and return the scored rows (CSV) so they can be streamed to a download"""
+        self.output.seek(0)
+        return self.output
+
+
+def iter_scored_chunks(source, model: ScoringModel = STANDARD_MODEL, chunksize=DEFAULT_CHUNK_ROWS,
+                       fmt='csv', columns=None, **read_csv_kwargs):
+    """Read a file in fixed-size chunks and yield each chunk with lead_score and lead_category"""
+    for chunk in iter_table_chunks(source, fmt=fmt, chunksize=chunksize, columns=columns, **read_csv_kwargs):
+        missing = [col for col in FEATURE_COLUMNS if col not in chunk.columns]
+        if missing:
+            raise MissingColumnsError(missing)
+
+        scores = model.score(chunk)
+        chunk['lead_score'] = scores
+        chunk['lead_category'] = model.categorize(scores)
+        yield chunk
+
+
+def score_file_stream(source, model: ScoringModel = STANDARD_MODEL, chunksize=DEFAULT_CHUNK_ROWS,
+                      fmt='csv', columns=None, preview_rows=10, write_output=True,
+                      spool_max_bytes=SPOOL_MAX_BYTES):
+    """
+    Score a CSV, Parquet or Arrow file chunk by chunk, accumulating summary statistics as it goes.
+
+    Only one chunk is held in memory at a time. When write_output is set the scored
+    rows are appended to a spooled temp file that can be streamed back to the user.
+    """
+    stats = LeadStats(model)
+    preview = None
+    output = tempfile.SpooledTemporaryFile(max_size=spool_max_bytes, mode='w+b') if write_output else None
+
+    try:
+        for chunk in iter_scored_chunks(source, model=model, chunksize=chunksize, fmt=fmt, columns=columns):
+            stats.update_frame(chunk)
+            if preview is None:
+                preview = chunk.head(preview_rows)
+            if output is not None:
+                chunk.to_csv(output, header=output.tell() == 0, index=False)
+    except Exception:
+        if output is not None:
+            output.close()
+        raise
+
+    if preview is None:
+        if output is not None:
+            output.close()
+        raise ValueError("The file contains no rows to score")
+
+    return StreamResult(stats=stats, preview=preview, output=output)
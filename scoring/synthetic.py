@@ -0,0 +1,261 @@
+"""Seedable synthetic leads with the shape of the ENTAB sample data, for demos and load tests.
+
+Write ten million leads for a benchmark with, for example:
+
+    python generate_leads.py 10000000 leads.parquet --seed 7
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from scoring.batch import OUTPUT_FORMATS
+from scoring.dtypes import FEATURE_DTYPE
+
+# Rows generated and written per step
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+# Sample student names
+FIRST_NAMES = (
+    "Aarav", "Aditi", "Arjun", "Ananya", "Ishaan", "Kavya", "Rohan", "Priya",
+    "Vivaan", "Diya", "Aditya", "Siya", "Karan", "Riya", "Vihaan", "Asha",
+    "Aryan", "Meera", "Reyansh", "Tara", "Ayaan", "Neha", "Rudra", "Pooja",
+    "Shivansh", "Shreya", "Arnav", "Khushi", "Kabir", "Nisha", "Devansh", "Ritika",
+    "Atharv", "Sakshi", "Hriday", "Bhavya", "Advait", "Tanvi", "Pranav", "Simran",
+    "Samarth", "Avni", "Parth", "Janvi", "Dhruv", "Kiara", "Vedant", "Myra",
+    "Anirudh", "Anika", "Shaurya", "Palak", "Krish", "Dia", "Yash", "Ira",
+    "Harsh", "Zara", "Nikhil", "Manya", "Raghav", "Mahika", "Siddharth", "Sejal"
+)
+
+LAST_NAMES = (
+    "Sharma", "Gupta", "Singh", "Kumar", "Patel", "Shah", "Agarwal", "Bansal",
+    "Jain", "Mittal", "Agrawal", "Chopra", "Malhotra", "Arora", "Kapoor", "Mehta",
+    "Verma", "Pandey", "Saxena", "Goyal", "Sinha", "Yadav", "Mishra", "Tiwari",
+    "Bhardwaj", "Kashyap", "Srivastava", "Chandra", "Bhatia", "Khanna", "Tandon", "Sethi"
+)
+
+# Sample previous schools
+PREVIOUS_SCHOOLS = (
+    "Delhi Public School", "Kendriya Vidyalaya", "Ryan International", "DAV Public School",
+    "St. Mary's Convent", "Holy Child School", "Modern School", "Bal Bharati Public School",
+    "Cambridge School", "Springdales School", "Amity International", "Gyan Bharati School",
+    "Little Angels School", "St. Xavier's School", "Mount Carmel School", "Sacred Heart School",
+    "Bharatiya Vidya Bhavan", "Lotus Valley School", "Heritage School", "Birla Public School"
+)
+
+# Sample locations (with varying distances from school) and their base scores
+LOCATIONS = (
+    ("Connaught Place", 95), ("Karol Bagh", 85), ("Lajpat Nagar", 80), ("Rajouri Garden", 75),
+    ("Dwarka", 70), ("Rohini", 65), ("Janakpuri", 80), ("Vasant Kunj", 85), ("Saket", 90),
+    ("Greater Kailash", 95), ("Nehru Place", 85), ("Tilak Nagar", 70), ("Pitampura", 60),
+    ("Preet Vihar", 75), ("Mayur Vihar", 70), ("Ashok Vihar", 65), ("Model Town", 80),
+    ("Civil Lines", 85), ("Khan Market", 95), ("Defence Colony", 90), ("Laxmi Nagar", 60),
+    ("Shahdara", 50), ("Uttam Nagar", 55), ("Najafgarh", 45), ("Narela", 40)
+)
+
+# How they know us options and their base scores
+KNOW_US_SOURCES = (
+    ("School Website", 60), ("Google Search", 65), ("Social Media", 70), ("Friend Referral", 85),
+    ("Newspaper Ad", 50), ("Hoarding/Banner", 45), ("Educational Fair", 75), ("Alumni Referral", 90),
+    ("Current Parent Referral", 95), ("Teacher Referral", 88), ("Brochure", 55), ("Walk-in", 40)
+)
+
+# Classes available and their base scores
+CLASSES = (
+    ("Nursery", 70), ("LKG", 75), ("UKG", 80), ("Class 1", 85), ("Class 2", 80),
+    ("Class 3", 75), ("Class 4", 70), ("Class 5", 65), ("Class 6", 85), ("Class 7", 80),
+    ("Class 8", 75), ("Class 9", 90), ("Class 10", 85), ("Class 11", 95), ("Class 12", 90)
+)
+
+# Classes without a previous percentage
+EARLY_CLASSES = ("Nursery", "LKG", "UKG")
+
+# Email domains and how often each is used
+EMAIL_DOMAINS = ("gmail.com", "yahoo.com", "hotmail.com", "outlook.com")
+EMAIL_DOMAIN_P = (0.7, 0.1, 0.1, 0.1)
+
+# Applications are dated this many days back at most
+APPLICATION_DAYS = 60
+
+# Flag columns are stored as codes into these labels
+YES_NO = ("No", "Yes")
+
+
+def _previous_school_range(name):
+    """Inclusive score range of a previous school by its reputation"""
+    if "DPS" in name or "St." in name or "Modern" in name:
+        return 80, 95
+    if "Ryan" in name or "DAV" in name or "Amity" in name:
+        return 70, 85
+    return 50, 75
+
+
+# Lookup tables derived once, so every text column is built from integer codes
+_SCHOOL_RANGES = np.array([_previous_school_range(name) for name in PREVIOUS_SCHOOLS])
+_LOCATION_SCORES = np.array([score for _, score in LOCATIONS])
+_SOURCE_SCORES = np.array([score for _, score in KNOW_US_SOURCES])
+_CLASS_SCORES = np.array([score for _, score in CLASSES])
+_EARLY_CLASS = np.array([name in EARLY_CLASSES for name, _ in CLASSES])
+_STUDENT_NAMES = [f"{first} {last}" for first in FIRST_NAMES for last in LAST_NAMES]
+_EMAILS = [f"{first.lower()}.{last.lower()}@{domain}"
+           for first in FIRST_NAMES for last in LAST_NAMES for domain in EMAIL_DOMAINS]
+# Previous percentages run from 65 to 98; code 0 is "N/A" for the early classes
+_PERCENTAGES = ["N/A"] + [f"{p}%" for p in range(65, 99)]
+
+
+def _clip(values):
+    return np.clip(values, 0, 100).astype(FEATURE_DTYPE)
+
+
+def _categorical(codes, categories):
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def _phone_numbers(numbers):
+    """'+91-XXXXXXXXXX' strings for ten digit numbers, built as fixed-width bytes instead of per-row formatting"""
+    chars = np.empty((len(numbers), 14), dtype=np.uint8)
+    chars[:, :4] = np.frombuffer(b"+91-", dtype=np.uint8)
+    for position in range(13, 3, -1):
+        numbers, digit = np.divmod(numbers, 10)
+        chars[:, position] = digit + ord("0")
+    return chars.view("S14").ravel().astype(str).astype(object)
+
+
+def generate_leads(n_rows, seed=None, today=None) -> pd.DataFrame:
+    """
+    Generate n_rows synthetic leads with every column drawn in one vectorized pass.
+
+    seed is an int or a numpy Generator; the same seed gives the same leads.
+    Text columns are categoricals over the sample tables and application dates
+    fall in the APPLICATION_DAYS before today (default: the current date).
+    """
+    rng = np.random.default_rng(seed)
+    today = np.datetime64(today if today is not None else "today", "D")
+
+    first = rng.integers(0, len(FIRST_NAMES), n_rows)
+    last = rng.integers(0, len(LAST_NAMES), n_rows)
+    name_code = first * len(LAST_NAMES) + last
+
+    location = rng.integers(0, len(LOCATIONS), n_rows)
+    location_score = _clip(_LOCATION_SCORES[location] + rng.integers(-10, 11, n_rows))
+
+    source = rng.integers(0, len(KNOW_US_SOURCES), n_rows)
+    know_score = _clip(_SOURCE_SCORES[source] + rng.integers(-5, 16, n_rows))
+
+    # Sibling in school (30% chance)
+    has_sibling = rng.random(n_rows) < 0.3
+    sibling_score = np.where(has_sibling, 100, rng.integers(0, 21, n_rows)).astype(FEATURE_DTYPE)
+
+    school = rng.integers(0, len(PREVIOUS_SCHOOLS), n_rows)
+    low, high = _SCHOOL_RANGES[school, 0], _SCHOOL_RANGES[school, 1]
+    school_score = rng.integers(low, high + 1).astype(FEATURE_DTYPE)
+
+    class_code = rng.integers(0, len(CLASSES), n_rows)
+    class_score = _clip(_CLASS_SCORES[class_code] + rng.integers(-5, 11, n_rows))
+
+    # Last class percentage, banded for older classes; early classes have none
+    early = _EARLY_CLASS[class_code]
+    percentage = rng.integers(65, 99, n_rows)
+    percentage_score = np.where(
+        early,
+        rng.integers(70, 101, n_rows),
+        np.select([percentage >= 90, percentage >= 80, percentage >= 70], [95, 80, 65], default=40)
+    ).astype(FEATURE_DTYPE)
+    percentage_code = np.where(early, 0, percentage - 64)
+
+    # Contact variations
+    email_different = rng.random(n_rows) < 0.2
+    email_score = np.where(email_different, rng.integers(60, 101, n_rows), 0).astype(FEATURE_DTYPE)
+    whatsapp_different = rng.random(n_rows) < 0.25
+    whatsapp_score = np.where(whatsapp_different, rng.integers(50, 101, n_rows), 0).astype(FEATURE_DTYPE)
+
+    domain = rng.choice(len(EMAIL_DOMAINS), n_rows, p=EMAIL_DOMAIN_P)
+    phone = rng.integers(7000000000, 10000000000, n_rows)
+
+    # The APPLICATION_DAYS possible dates are formatted once and sampled by code
+    dates = np.datetime_as_string(today - np.arange(1, APPLICATION_DAYS + 1), unit="D")
+    days_ago = rng.integers(0, APPLICATION_DAYS, n_rows)
+
+    return pd.DataFrame({
+        'student_name': _categorical(name_code, _STUDENT_NAMES),
+        'email': _categorical(name_code * len(EMAIL_DOMAINS) + domain, _EMAILS),
+        'phone': _phone_numbers(phone),
+        'location': _categorical(location, [name for name, _ in LOCATIONS]),
+        'location_score': location_score,
+        'how_you_know_us': _categorical(source, [name for name, _ in KNOW_US_SOURCES]),
+        'how_you_know_us_score': know_score,
+        'has_sibling_in_school': _categorical(has_sibling.astype(np.int8), YES_NO),
+        'sibling_in_school_score': sibling_score,
+        'previous_school_name': _categorical(school, PREVIOUS_SCHOOLS),
+        'previous_school_name_score': school_score,
+        'class_applied_for': _categorical(class_code, [name for name, _ in CLASSES]),
+        'class_applied_for_score': class_score,
+        'last_class_percentage': _categorical(percentage_code, _PERCENTAGES),
+        'last_class_percentage_score': percentage_score,
+        'communication_email_different': _categorical(email_different.astype(np.int8), YES_NO),
+        'communication_email_different_score': email_score,
+        'whatsapp_number_different': _categorical(whatsapp_different.astype(np.int8), YES_NO),
+        'whatsapp_number_different_score': whatsapp_score,
+        'application_date': _categorical(days_ago, dates)
+    })
+
+
+def iter_lead_chunks(n_rows, seed=None, chunk_rows=DEFAULT_CHUNK_ROWS, today=None):
+    """Yield n_rows synthetic leads chunk_rows at a time; the same seed and chunk_rows give the same leads"""
+    rng = np.random.default_rng(seed)
+    for start in range(0, n_rows, chunk_rows):
+        yield generate_leads(min(chunk_rows, n_rows - start), seed=rng, today=today)
+
+
+def write_leads(path, n_rows, seed=None, chunk_rows=DEFAULT_CHUNK_ROWS, today=None):
+    """Write n_rows synthetic leads to a .csv or .parquet file chunk by chunk and return the rows written"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output type '{extension}'. Supported: {', '.join(OUTPUT_FORMATS)}")
+    chunks = iter_lead_chunks(n_rows, seed=seed, chunk_rows=chunk_rows, today=today)
+    if n_rows <= 0:
+        # Still write the header / schema
+        chunks = [generate_leads(0, today=today)]
+
+    import pyarrow as pa
+    import pyarrow.csv as pcsv
+    import pyarrow.parquet as pq
+
+    # Both formats go through Arrow; its CSV writer is several times faster than DataFrame.to_csv
+    written = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            # Categories are fixed, so every chunk gets the same dictionary-encoded schema
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pcsv.CSVWriter(path, table.schema) if OUTPUT_FORMATS[extension] == 'csv' \
+                    else pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+            written += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic ENTAB leads for demos and load tests.")
+    parser.add_argument("rows", type=int, help="number of leads to generate")
+    parser.add_argument("output", help="output .csv or .parquet file")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        written = write_leads(args.output, args.rows, seed=args.seed, chunk_rows=args.chunk_rows)
+    except (OSError, ValueError) as e:
+        print(f"Failed to write {args.output}: {e}", file=sys.stderr)
+        return 1
+    print(f"Wrote {written:,} leads to {args.output} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 0
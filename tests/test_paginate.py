@@ -0,0 +1,33 @@
+import asyncio
+
+import httpx
+
+from leads.paginate import LeadPaginator
+
+# Upstream leads, and the most it serves a page whatever limit is asked for
+RECORDS = [{"_id": f"id{i:03d}"} for i in range(120)]
+UPSTREAM_LIMIT = 50
+
+
+def upstream(request):
+    page = int(request.url.params['page'])
+    size = min(int(request.url.params['limit']), UPSTREAM_LIMIT)
+    return httpx.Response(200, json={"data": RECORDS[(page - 1) * size:page * size], "total": len(RECORDS)})
+
+
+def collect(**options):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(upstream)) as client:
+            return await LeadPaginator(client, "http://upstream/leads", **options).collect()
+    return asyncio.run(run())
+
+
+def test_short_pages_under_a_total_are_followed():
+    result = collect(page_size=100)
+    assert (result["total"], result["fetched"], result["truncated"]) == (120, 120, False)
+    assert [record["_id"] for record in result["data"]] == [record["_id"] for record in RECORDS]
+
+
+def test_page_cap_counts_served_pages():
+    result = collect(page_size=100, max_pages=2)
+    assert (result["total"], result["fetched"], result["truncated"]) == (120, 100, True)
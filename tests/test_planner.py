@@ -0,0 +1,30 @@
+import pytest
+
+from leads.planner import plan_query
+
+# Field values the planner recognises in questions
+VALUES = {'source': ['website', 'social media'], 'class': ['5A', '5B'], 'location': ['NOIDA']}
+
+
+@pytest.mark.parametrize("question", [
+    "how many enquiries received this year",
+    "how many students are enrolled",
+    "how many got admission",
+    "how many have registered",
+    "how many leads so far",
+    "how many leads last week",
+    "how many leads this month",
+])
+def test_time_and_outcome_questions_go_to_the_llm(question):
+    assert plan_query(question, VALUES) is None
+
+
+def test_count_with_known_values():
+    plan = plan_query("how many male students from noida in class 5", VALUES)
+    assert plan.intent == 'count'
+    assert plan.filters == {'gender': ('Male',), 'location': ('NOIDA',), 'class': ('5A', '5B')}
+
+
+def test_top_names_a_breakdown():
+    plan = plan_query("top sources", VALUES)
+    assert (plan.intent, plan.group_by) == ('breakdown', 'source')
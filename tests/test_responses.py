@@ -0,0 +1,39 @@
+from leads.responses import ResponseCache
+
+# Field values of the data the cached answers were derived from
+VALUES = ["Male", "Female", "website", "Sector 100, NOIDA", "DLF Phase 2, Gurgaon"]
+
+NOIDA_QUESTION = "How many students are male and live in noida"
+
+
+def cache_with_noida_answer():
+    cache = ResponseCache()
+    cache.put(NOIDA_QUESTION, "{}", "v1", "noida answer", values=VALUES)
+    return cache
+
+
+def test_rephrased_question_hits():
+    cache = cache_with_noida_answer()
+    assert cache.get("Please tell me how many students are male and live in Noida?", "{}", "v1") == "noida answer"
+
+
+def test_different_data_value_misses():
+    cache = cache_with_noida_answer()
+    assert cache.get("How many students are male and live in gurgaon", "{}", "v1") is None
+
+
+def test_dropped_clause_misses():
+    cache = cache_with_noida_answer()
+    assert cache.get("How many students are male", "{}", "v1") is None
+
+
+def test_value_missing_from_data_misses():
+    cache = cache_with_noida_answer()
+    assert cache.get("How many students are male and live in faridabad", "{}", "v1") is None
+
+
+def test_no_similarity_without_data_values():
+    cache = ResponseCache()
+    cache.put(NOIDA_QUESTION, "{}", "v1", "noida answer")
+    assert cache.get(NOIDA_QUESTION + "?", "{}", "v1") == "noida answer"
+    assert cache.get("Please tell me how many students are male and live in noida", "{}", "v1") is None
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from scoring import FEATURE_COLUMNS, STANDARD_MODEL, LeadStats
+
+LEADS = pd.DataFrame(
+    np.random.default_rng(3).integers(0, 101, size=(50, len(FEATURE_COLUMNS))).astype(float),
+    columns=FEATURE_COLUMNS
+)
+
+
+def test_missing_cell_leaves_one_lead_unscored():
+    df = LEADS.copy()
+    df.iloc[4, 2] = np.nan
+    scores = pd.Series(STANDARD_MODEL.score(df))
+    stats = LeadStats.from_frame(df)
+
+    assert stats.count == 50
+    assert stats.scored == 49
+    assert stats.score_min == scores.min()
+    assert stats.score_max == scores.max()
+    assert np.isclose(stats.mean, scores.mean())
+    assert stats.histogram.sum() == 49
+    expected = [df[column].corr(scores) for column in FEATURE_COLUMNS]
+    assert np.allclose(stats.feature_correlations(), expected)
+
+
+def test_no_complete_row_has_no_score_range():
+    df = LEADS.copy()
+    df.iloc[:, 0] = np.nan
+    stats = LeadStats.from_frame(df)
+
+    assert stats.count == 50
+    assert stats.scored == 0
+    assert np.isnan(stats.mean)
+    assert np.isnan(stats.feature_correlations()).all()
@@ -0,0 +1,43 @@
+import asyncio
+
+import httpx
+
+from leads.paginate import LeadPaginator
+from leads.store import LeadStore
+
+# Upstream leads, oldest first
+RECORDS = [{"_id": f"id{i:02d}", "createdAt": f"2024-01-{i + 1:02d}"} for i in range(20)]
+
+# Most leads upstream serves a page
+UPSTREAM_LIMIT = 4
+
+
+def upstream(request):
+    page, size = int(request.url.params['page']), min(int(request.url.params['limit']), UPSTREAM_LIMIT)
+    since = request.url.params.get('createdAfter')
+    rows = [record for record in RECORDS if since is None or record['createdAt'] > since]
+    return httpx.Response(200, json={"data": rows[(page - 1) * size:page * size], "total": len(rows)})
+
+
+def sync(store):
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(upstream)) as client:
+            # Twelve leads per walk, as upstream serves four of the five asked for a page
+            return await store.sync(LeadPaginator(client, "http://upstream/leads", page_size=5, max_pages=3))
+    return asyncio.run(run())
+
+
+def test_capped_load_is_not_ready(tmp_path):
+    store = LeadStore(str(tmp_path / "leads.sqlite"))
+    assert sync(store) == 12
+    assert not store.ready
+    assert store.count() == 12
+
+
+def test_backfill_resumes_until_complete(tmp_path):
+    store = LeadStore(str(tmp_path / "leads.sqlite"))
+    sync(store)
+    assert sync(store) == 8
+    assert store.ready
+    assert store.count() == 20
+    assert sync(store) == 0